@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+jsonio.py — KG/로그 JSON 파싱·직렬화 공용 헬퍼
+
+orjson(C 확장)이 있으면 그것으로 파싱하고, 없으면 표준 json 을 쓴다.
+orjson 은 표준 json 이 받아들이는 일부 입력(NaN/Infinity)을 거부하고, 64비트를 넘는
+정수는 float 로 바꿔 읽는다. 거부되면 표준 json 으로 다시 파싱하고, 19자리 이상
+숫자열이 있으면 처음부터 표준 json 으로 파싱한다 — 결과는 항상 json.loads 와 같다.
+
+직렬화도 같은 원칙: orjson 이 표준 json 과 다르게 쓰는 값(NaN/Infinity → null,
+지수 표기 float, 64비트를 넘는 정수 → TypeError)이 있으면 표준 json 으로 직렬화한다
+— 결과는 항상 json.dumps(ensure_ascii=False, indent=2) 와 같다.
+
+KG 파일 로드(json_load_file)는 한 곳에서 백엔드를 고른다:
+orjson → mmap 한 파일을 json_loads 로 / ijson → 최상위 키 스트리밍 / 표준 json.
+
+사용법:
+  from src.jsonio import json_load_file, json_loads, json_dumps
+  kg = json_load_file(path)
+  path.write_bytes(json_dumps(kg))
+"""
+
+import json
+import math
+import mmap
+import os
+import re
+
+try:
+    import orjson   # C 확장 JSON 코덱 (선택) — 없으면 ijson / 표준 json
+except ImportError:
+    orjson = None
+
+try:
+    import ijson    # 스트리밍 JSON 파서 (선택) — 없으면 표준 json
+except ImportError:
+    ijson = None
+
+# json_load_file 이 깨진 JSON 에 던지는 예외 — 파일 없음/읽기 불가는 OSError 로 따로
+JSON_ERRORS = (ValueError,) + ((ijson.JSONError,) if ijson else ())
+
+
+# 64비트 범위를 벗어날 수 있는 정수 후보 (|n| ≥ 10^18) — orjson 은 이를 float 로 읽는다
+_WIDE_DIGITS   = re.compile(r"\d{19}")
+_WIDE_DIGITS_B = re.compile(rb"\d{19}")
+
+
+def json_loads(data):
+    """bytes/bytearray/memoryview/str 을 파싱 — orjson 우선, 거부되면 표준 json 으로 재시도"""
+    if orjson is not None and not (
+        _WIDE_DIGITS if isinstance(data, str) else _WIDE_DIGITS_B
+    ).search(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass    # NaN/Infinity 등 표준 json 만 허용하는 값
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def json_load_file(path):
+    """JSON 파일 파싱 — orjson 은 mmap 으로 페이지 캐시를 그대로, ijson 은 최상위 키 스트리밍, 아니면 표준 json"""
+    with open(path, "rb") as f:
+        if orjson is not None:
+            if os.fstat(f.fileno()).st_size == 0:
+                return json_loads(f.read())     # 빈 파일은 mmap 불가 — 파싱 오류는 그대로
+            # read() 사용자 공간 복사 생략
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mm, "madvise"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                with memoryview(mm) as buf:
+                    return json_loads(buf)
+        if ijson is not None:
+            # 최상위 키(nodes/edges/meta)를 파일에서 바로 스트리밍 — 원문 문자열 사본 없음
+            return dict(ijson.kvitems(f, "", use_float=True))
+        return json.load(f)
+
+
+if orjson is not None:
+    _DUMP_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+
+def _orjson_differs(obj) -> bool:
+    """orjson 이 표준 json 과 다르게 쓰는 float 포함 여부 — NaN/±Infinity, 지수 표기(1e+16, 1e-05)"""
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if isinstance(o, dict):
+            stack.extend(o.values())
+            stack.extend(k for k in o if isinstance(k, float))
+        elif isinstance(o, (list, tuple)):
+            stack.extend(o)
+        elif isinstance(o, float) and (not math.isfinite(o) or "e" in repr(o)):
+            return True
+    return False
+
+
+def json_dumps(obj, newline: bool = False) -> bytes:
+    """json.dumps(ensure_ascii=False, indent=2) 와 같은 UTF-8 bytes — orjson 우선, 다르게 쓰면 표준 json"""
+    if orjson is not None:
+        try:
+            out = orjson.dumps(obj, option=_DUMP_OPTS | (orjson.OPT_APPEND_NEWLINE if newline else 0))
+        except TypeError:
+            pass    # 64비트를 넘는 정수 등 orjson 이 직렬화하지 않는 값
+        else:
+            if not _orjson_differs(obj):
+                return out
+    text = json.dumps(obj, ensure_ascii=False, indent=2)
+    return (text + "\n" if newline else text).encode("utf-8")
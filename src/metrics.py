@@ -30,12 +30,15 @@ v4 창발 공식 (n-102 제안, 록이):
 
 수입:
   from src.metrics import compute_all_metrics
+  from src.metrics import metrics_state, compute_all_metrics_incremental  # 엣지 추가 delta
 """
 
 import json
+import math
 import os
 import sys
 import statistics
+from bisect import insort
 from pathlib import Path
 from collections import Counter
 
@@ -57,6 +60,19 @@ def _node_num(nid: str) -> int:
         return 0
 
 
+def _cser_norm(s: str) -> str:
+    if s in ("cokac-bot", "cokac"):
+        return "cokac"
+    if s in ("록이", "상록"):
+        return "록이"
+    # Strip persona suffixes to compare by model/vendor only
+    for suffix in ("-critic", "-synthesizer", "-analyst", "-explorer",
+                   "-challenger", "-integrator", "-human"):
+        if s.endswith(suffix):
+            return s[:-len(suffix)]
+    return s
+
+
 # ─── 개별 지표 함수 ───────────────────────────────────────────────────────────
 
 def compute_cser(kg: dict) -> float:
@@ -66,18 +82,7 @@ def compute_cser(kg: dict) -> float:
 
     임계값: > 0.5 → 에코 챔버 탈출 (Layer 1-A)
     """
-    def _norm(s: str) -> str:
-        if s in ("cokac-bot", "cokac"):
-            return "cokac"
-        if s in ("록이", "상록"):
-            return "록이"
-        # Strip persona suffixes to compare by model/vendor only
-        for suffix in ("-critic", "-synthesizer", "-analyst", "-explorer",
-                       "-challenger", "-integrator", "-human"):
-            if s.endswith(suffix):
-                return s[:-len(suffix)]
-        return s
-    node_src = {n["id"]: _norm(n.get("source", "")) for n in kg["nodes"]}
+    node_src = {n["id"]: _cser_norm(n.get("source", "")) for n in kg["nodes"]}
     n_edges = len(kg["edges"])
     if n_edges == 0:
         return 0.0
@@ -309,6 +314,139 @@ def compute_all_metrics(kg: dict = None) -> dict:
     }
 
 
+# ─── 증분 계산 (엣지 추가 전용) ──────────────────────────────────────────────
+
+def metrics_state(kg: dict) -> dict:
+    """
+    compute_all_metrics_incremental용 원시 누적 상태 (O(노드+엣지) 1회).
+
+    엣지만 추가되는 경우(노드 불변) 지표는 엣지별 기여의 합/개수로 분해됨:
+      CSER / DXI  → 교차 엣지 수, 대상 엣지 수
+      edge_span   → span 정렬 리스트, 합, 제곱합
+      DCI         → 질문별 최대 answers gap
+    node_age_diversity / tag_convergence는 노드만 보므로 그대로 유지.
+    """
+    cser_src = {n["id"]: _cser_norm(n.get("source", "")) for n in kg["nodes"]}
+    node_domain = {}
+    for n in kg["nodes"]:
+        onto = n.get("ontology")
+        if onto and isinstance(onto, dict):
+            node_domain[n["id"]] = onto.get("domain", "")
+
+    state = {
+        "n_nodes":      len(kg["nodes"]),
+        "n_edges":      0,
+        "cser_src":     cser_src,
+        "cser_cross":   0,
+        "node_domain":  node_domain,
+        "dxi_cross":    0,
+        "dxi_counted":  0,
+        "spans":        [],
+        "span_sum":     0,
+        "span_sq":      0,
+        "questions":    {n["id"] for n in kg["nodes"] if n.get("type") == "question"},
+        "answers_gap":  {},
+        "node_age_div": compute_node_age_diversity(kg),
+        "tag_conv":     compute_tag_convergence(kg),
+    }
+    _apply_edges(state, kg["edges"])
+    state["spans"].sort()
+    return state
+
+
+def _apply_edges(state: dict, edges: list, spans: list = None) -> None:
+    """edges의 기여를 state 카운터에 누적. spans 지정 시 span을 정렬 삽입 (없으면 state["spans"]에 append)."""
+    cser_src, node_domain = state["cser_src"], state["node_domain"]
+    questions, answers_gap = state["questions"], state["answers_gap"]
+    for e in edges:
+        u, v = e["from"], e["to"]
+        state["n_edges"] += 1
+        if cser_src.get(u, "") != cser_src.get(v, ""):
+            state["cser_cross"] += 1
+
+        d_from, d_to = node_domain.get(u, ""), node_domain.get(v, "")
+        if d_from and d_to:
+            state["dxi_counted"] += 1
+            if d_from != d_to:
+                state["dxi_cross"] += 1
+
+        span = abs(_node_num(u) - _node_num(v))
+        state["span_sum"] += span
+        state["span_sq"]  += span * span
+        if spans is None:
+            state["spans"].append(span)
+        else:
+            insort(spans, span)
+
+        if e.get("relation") == "answers":
+            for q in (u, v):
+                if q in questions:
+                    answers_gap[q] = max(answers_gap.get(q, 0), span)
+
+
+def compute_all_metrics_incremental(state: dict, new_edges: list) -> dict:
+    """
+    metrics_state(kg) 상태에 new_edges를 더한 KG의 compute_all_metrics 결과.
+    비용: O(|new_edges|) 카운터 갱신 + span 정렬 리스트 복사 1회 (C 수준 memcpy) — 전체 재순회 없음.
+    state는 변경하지 않음. 결과는 compute_all_metrics와 동일
+    (edge_span.stdev만 부동소수 최하위 비트 차이 가능 — 반올림 후 동일).
+    """
+    st = dict(state, answers_gap=dict(state["answers_gap"]))
+    spans = list(state["spans"])
+    st["spans"] = spans
+    _apply_edges(st, new_edges, spans)
+
+    n_edges = st["n_edges"]
+    cser = round(st["cser_cross"] / n_edges, 4) if n_edges else 0.0
+    dxi  = round(st["dxi_cross"] / st["dxi_counted"], 4) if n_edges and st["dxi_counted"] else 0.0
+
+    total_questions, total_nodes = len(st["questions"]), st["n_nodes"]
+    if total_questions == 0 or total_nodes == 0:
+        dci = 0.0
+    else:
+        dci = round(min(1.0, sum(st["answers_gap"].values()) / (total_questions * total_nodes)), 4)
+
+    if not spans:
+        edge_span = {"raw": 0.0, "normalized": 0.0, "max": 0, "min": 0, "median": 0.0}
+    else:
+        n, total = len(spans), st["span_sum"]
+        # statistics.mean / median / stdev와 같은 값 (정수 데이터 기준)
+        raw = total // n if total % n == 0 else total / n
+        mid = n // 2
+        median = spans[mid] if n % 2 else (spans[mid - 1] + spans[mid]) / 2
+        stdev = math.sqrt((n * st["span_sq"] - total * total) / (n * (n - 1))) if n > 1 else 0.0
+        edge_span = {
+            "raw": round(raw, 3),
+            "normalized": round(raw / max(total_nodes - 1, 1), 4),
+            "max": spans[-1],
+            "min": spans[0],
+            "median": round(median, 1),
+            "stdev": round(stdev, 3),
+        }
+
+    node_age_div, tag_conv = st["node_age_div"], st["tag_conv"]
+    e_v3 = compute_emergence_v3(cser, dci, tag_conv)
+    e_v4 = compute_emergence_v4(cser, dci, edge_span["normalized"], node_age_div)
+    e_v5 = compute_emergence_v5(cser, dci, edge_span["normalized"], node_age_div, dxi)
+
+    return {
+        "nodes": total_nodes,
+        "edges": n_edges,
+        "CSER": cser,
+        "DCI": dci,
+        "DXI": dxi,
+        "edge_span": edge_span,
+        "node_age_diversity": node_age_div,
+        "tag_convergence": tag_conv,
+        "convergence_health": round(1.0 - tag_conv, 4),
+        "E_v3": e_v3,
+        "E_v4": e_v4,
+        "E_v5": e_v5,
+        "E_delta_v4_v3": round(e_v4 - e_v3, 4),
+        "E_delta_v5_v4": round(e_v5 - e_v4, 4),
+    }
+
+
 # ─── CLI ─────────────────────────────────────────────────────────────────────
 
 def main():
@@ -26,22 +26,32 @@ combined_v4 = 0.50×edge_span_norm + 0.30×node_age_diversity + 0.20×cross_bonu
   python3 src/pair_designer_v4.py --add N      # KG에 N개 추가 + Δ(E_v4 - E_v3) 측정
   python3 src/pair_designer_v4.py --verify     # 마지막 추가 결과 출력
   python3 src/pair_designer_v4.py --compare    # v3 vs v4 선택 비교
+  python3 src/pair_designer_v4.py --cache      # 상위 후보를 사용자 캐시에 저장·재사용 (선택)
 
 구현: 록이 (냉정한 판사) — 사이클 78, D-070
 """
 
-import json
-import re
+import os
 import sys
-import statistics
+import heapq
+import hashlib
+import pickle
+from array import array
+from functools import lru_cache
+from bisect import bisect_left
 from pathlib import Path
 from datetime import date
-from itertools import combinations
 
 REPO = Path(__file__).parent.parent
 KG_FILE     = REPO / "data" / "knowledge-graph.json"
 RESULT_FILE = REPO / "data" / "pair_designer_v4_log.json"
 
+# --cache 시 상위 후보 캐시 — 저장소(data/) 밖 사용자 캐시 디렉터리에
+CACHE_DIR   = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "emergent"
+CAND_CACHE  = CACHE_DIR / "pair_designer_v4_candidates.pkl"
+# 캐시된 결과를 만드는 코드 — KG 내용과 함께 키에 들어가 하나라도 바뀌면 무효
+CACHE_SOURCES = (Path(__file__), REPO / "src" / "jsonio.py", REPO / "src" / "metrics.py")
+
 VERSION = "v4"
 CYCLE   = 78
 
@@ -64,6 +74,8 @@ DCI_FEEDING_RELATIONS = {"answers", "addresses"}
 # 출처 분류
 LOKI_SOURCES  = {"록이", "상록"}
 COKAC_SOURCES = {"cokac", "cokac-bot"}
+# 출처 → 정수 코드 (0=기타, 1=록이, 2=cokac) — 교차 판정을 정수 비교 한 번으로
+SRC_CODE = {s: 1 for s in LOKI_SOURCES} | {s: 2 for s in COKAC_SOURCES}
 
 # ─── 타입 호환성 행렬 (v3 동일) ────────────────────────────────────────────────
 TYPE_COMPAT = {
@@ -122,8 +134,52 @@ DEFAULT_RELATION = ("relates_to", "의미론적 연결")
 
 # ─── I/O ─────────────────────────────────────────────────────────────────────
 
+try:
+    from src.jsonio import json_dumps, json_loads as _json_loads   # orjson 우선, 어긋나는 값은 표준 json
+except ImportError:
+    # 스크립트 직접 실행 시 REPO가 sys.path에 없음
+    sys.path.insert(0, str(REPO))
+    from src.jsonio import json_dumps, json_loads as _json_loads
+
+
+def _json_dumps(obj) -> str:
+    """json.dumps(ensure_ascii=False, indent=2) + 개행과 같은 출력 (NaN·큰 정수 포함)."""
+    return json_dumps(obj, newline=True).decode("utf-8")
+
+
+def _write_json(path: Path, obj) -> None:
+    """_json_dumps와 동일한 내용을 UTF-8 bytes로 기록"""
+    path.write_bytes(json_dumps(obj, newline=True))
+
+
+def _cache_key(kg_bytes: bytes) -> bytes:
+    """KG 바이트 + CACHE_SOURCES 내용의 해시 — mtime 과 달리 복사·체크아웃·import 모듈 수정에도 정확"""
+    h = hashlib.blake2b(kg_bytes, digest_size=16)
+    for src in CACHE_SOURCES:
+        h.update(src.read_bytes())
+    return h.digest()
+
+
+def _read_cache(path: Path, key: bytes):
+    """key 가 일치하는 캐시 본문, 없거나 깨졌거나 낡았으면 None"""
+    try:
+        cached_key, value = pickle.loads(path.read_bytes())
+    except Exception:
+        # 잘린 파일·다른 버전이 남긴 pickle(AttributeError/ImportError 등) — 캐시는 다시 만들면 그만
+        return None
+    return value if cached_key == key else None
+
+
+def _write_cache(path: Path, key: bytes, value) -> None:
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(pickle.dumps((key, value), protocol=5))
+    except OSError:
+        pass
+
+
 def load_kg() -> dict:
-    return json.loads(KG_FILE.read_text(encoding="utf-8"))
+    return _json_loads(KG_FILE.read_bytes())
 
 
 def save_kg(kg: dict) -> None:
@@ -143,15 +199,30 @@ def save_kg(kg: dict) -> None:
         kg["meta"]["total_nodes"]  = len(kg["nodes"])
         kg["meta"]["total_edges"]  = len(kg["edges"])
         kg["meta"]["last_updated"] = str(date.today())
-    KG_FILE.write_text(
-        json.dumps(kg, ensure_ascii=False, indent=2) + "\n",
-        encoding="utf-8",
-    )
+    _write_json(KG_FILE, kg)
+
+
+def load_candidates(key: bytes, top_n: int):
+    """
+    캐시된 rank_candidates 결과 → (candidates[:top_n], stats).
+    key(_cache_key)가 같고 캐시된 K >= top_n일 때만, 아니면 None.
+    """
+    cached = _read_cache(CAND_CACHE, key)
+    if cached is None:
+        return None
+    k, stats, candidates = cached
+    if k < top_n:
+        return None
+    return candidates[:top_n], stats
+
+
+def save_candidates(key: bytes, top_n: int, candidates: list, stats: dict) -> None:
+    _write_cache(CAND_CACHE, key, (top_n, stats, candidates))
 
 
 def load_log() -> dict:
     if RESULT_FILE.exists():
-        return json.loads(RESULT_FILE.read_text(encoding="utf-8"))
+        return _json_loads(RESULT_FILE.read_bytes())
     return {
         "meta": {
             "description": "pair_designer v4 이력 (CSER 제약 제거 + edge_span 직접 최적화)",
@@ -163,10 +234,7 @@ def load_log() -> dict:
 
 
 def save_log(data: dict) -> None:
-    RESULT_FILE.write_text(
-        json.dumps(data, ensure_ascii=False, indent=2) + "\n",
-        encoding="utf-8",
-    )
+    _write_json(RESULT_FILE, data)
 
 
 # ─── 유틸 ─────────────────────────────────────────────────────────────────────
@@ -178,8 +246,13 @@ def node_num(nid: str) -> int:
         return 0
 
 
+# tokenize 구분자 → 공백 치환 테이블 (정규식 대신 str.translate + split()).
+# 공백류(\s, \u3000 포함)는 str.split()이 그대로 처리
+_DELIM_TBL = str.maketrans(dict.fromkeys(".,!?;:「」『』【】()（）-_/", " "))
+
+
 def tokenize(text: str) -> set:
-    words = re.split(r"[\s\n\r\t\u3000.,!?;:「」『』【】()（）\-_/]+", text.lower())
+    words = text.lower().translate(_DELIM_TBL).split()
     return {w for w in words if len(w) >= 2 and not w.isdigit()}
 
 
@@ -188,18 +261,51 @@ def jaccard(a: set, b: set) -> float:
     return len(a & b) / len(union) if union else 0.0
 
 
+def tag_vocab(nodes: list) -> dict:
+    """태그 → 비트 (1 << i). 노드 태그 집합을 int 비트마스크로 표현하기 위한 어휘."""
+    tags = sorted({t for n in nodes for t in n.get("tags", [])})
+    return {t: 1 << i for i, t in enumerate(tags)}
+
+
+def jaccard_bits(a: int, b: int) -> float:
+    """비트마스크 태그 집합의 Jaccard — jaccard()와 동일 값, 집합 할당 없이 popcount만."""
+    union = (a | b).bit_count()
+    return (a & b).bit_count() / union if union else 0.0
+
+
+def symm_key(t1: str, t2: str) -> tuple:
+    """순서 무관 타입 쌍 키 — sorted() 리스트/정렬 없이 비교 1회."""
+    return (t1, t2) if t1 <= t2 else (t2, t1)
+
+
+# 타입 쌍 결과는 두 타입에만 의존 — k ≤ 20이면 캐시가 금방 채워지고 이후는 dict 조회 1회
+@lru_cache(maxsize=None)
 def type_compat(t1: str, t2: str) -> float:
-    return TYPE_COMPAT.get(tuple(sorted([t1, t2])), DEFAULT_COMPAT)
+    return TYPE_COMPAT.get(symm_key(t1, t2), DEFAULT_COMPAT)
 
 
+@lru_cache(maxsize=None)
 def infer_relation(t1: str, t2: str) -> tuple:
-    key = tuple(sorted([t1, t2]))
+    key = symm_key(t1, t2)
     rel, lbl = RELATION_HINT.get(key, DEFAULT_RELATION)
     if rel in DCI_FEEDING_RELATIONS:
         return ("resonates_with", f"{t1}↔{t2} 공명")
     return rel, lbl
 
 
+def build_type_tables(nodes: list) -> tuple:
+    """
+    노드 타입 → 정수 코드 + k×k 호환성/관계 테이블.
+    타입 종류(k)는 10~15개 수준 — 쌍마다 키 구성 + dict 조회 대신 리스트 인덱싱.
+    반환: (type_idx, compat_tbl, rel_tbl) — compat_tbl[a][b] = type_compat, rel_tbl[a][b] = infer_relation
+    """
+    types    = sorted({n.get("type", "") for n in nodes})
+    type_idx = {t: k for k, t in enumerate(types)}
+    compat_tbl = [[type_compat(t1, t2) for t2 in types] for t1 in types]
+    rel_tbl    = [[infer_relation(t1, t2) for t2 in types] for t1 in types]
+    return type_idx, compat_tbl, rel_tbl
+
+
 def classify_source(src: str) -> str:
     if src in LOKI_SOURCES:  return "록이"
     if src in COKAC_SOURCES: return "cokac"
@@ -207,14 +313,25 @@ def classify_source(src: str) -> str:
 
 
 def is_cross_source(n1: dict, n2: dict) -> bool:
-    t1 = classify_source(n1.get("source", ""))
-    t2 = classify_source(n2.get("source", ""))
-    return t1 != t2 and "기타" not in (t1, t2)
+    c1 = SRC_CODE.get(n1.get("source", ""), 0)
+    c2 = SRC_CODE.get(n2.get("source", ""), 0)
+    return c1 != c2 and c1 != 0 and c2 != 0
 
 
 # ─── v4 핵심: edge_span_norm + node_age_diversity 직접 점수화 ─────────────────
 
-def score_pair_v4(n1: dict, n2: dict, max_node_id: int, kg_stdev: float, kg_mean: float) -> dict:
+def node_features(n: dict, vocab: dict) -> tuple:
+    """의미론 점수용 노드 특징 (태그 비트마스크, 내용+라벨 토큰) — 노드당 1회 계산해 재사용."""
+    bits = 0
+    for t in n.get("tags", []):
+        bits |= vocab[t]
+    return bits, tokenize(n.get("content", "") + " " + n.get("label", ""))
+
+
+def score_pair_v4(n1: dict, n2: dict, max_node_id: int,
+                  feats1: tuple = None, feats2: tuple = None,
+                  t_compat: float = None, relation: str = None,
+                  nid1: int = None, nid2: int = None) -> dict:
     """
     v4 점수 계산.
     combined_v4 = W_EDGE_SPAN×edge_span_norm + W_NODE_AGE×age_contribution + W_CROSS×cross_flag
@@ -222,9 +339,12 @@ def score_pair_v4(n1: dict, n2: dict, max_node_id: int, kg_stdev: float, kg_mean
     edge_span_norm: 이 엣지의 span / max_node_id
     age_contribution: 두 노드 ID의 차이가 전체 node_age_diversity에 기여하는 정도 (proxy)
     cross_flag: 교차출처이면 1.0, 아니면 0.0
+    feats1/feats2: 같은 tag_vocab으로 만든 node_features() 결과 (둘 다 없으면 여기서 계산)
+    t_compat/relation: build_type_tables() 조회 결과 (없으면 여기서 계산)
+    nid1/nid2: node_num() 결과 (없으면 여기서 파싱)
     """
-    id1  = node_num(n1["id"])
-    id2  = node_num(n2["id"])
+    id1  = node_num(n1["id"]) if nid1 is None else nid1
+    id2  = node_num(n2["id"]) if nid2 is None else nid2
     span = abs(id1 - id2)
 
     edge_span_norm = span / max_node_id if max_node_id > 0 else 0.0
@@ -245,23 +365,30 @@ def score_pair_v4(n1: dict, n2: dict, max_node_id: int, kg_stdev: float, kg_mean
     )
 
     # 관계 추론 (DCI feeding 필터용)
-    relation, _ = infer_relation(n1.get("type", ""), n2.get("type", ""))
+    if relation is None:
+        relation, _ = infer_relation(n1.get("type", ""), n2.get("type", ""))
 
     # 의미론적 점수 (필터용 — v3 방식 유지)
-    tags1    = set(n1.get("tags", []))
-    tags2    = set(n2.get("tags", []))
-    tag_sim  = jaccard(tags1, tags2)
-    t_compat = type_compat(n1.get("type", ""), n2.get("type", ""))
-    c1       = tokenize(n1.get("content", "") + " " + n1.get("label", ""))
-    c2       = tokenize(n2.get("content", "") + " " + n2.get("label", ""))
+    if feats1 is None or feats2 is None:
+        vocab  = tag_vocab((n1, n2))
+        feats1 = node_features(n1, vocab)
+        feats2 = node_features(n2, vocab)
+    tags1, c1 = feats1
+    tags2, c2 = feats2
+    tag_sim  = jaccard_bits(tags1, tags2)
+    if t_compat is None:
+        t_compat = type_compat(n1.get("type", ""), n2.get("type", ""))
     cont_sim = jaccard(c1, c2)
     semantic = round(0.40 * tag_sim + 0.35 * t_compat + 0.25 * cont_sim, 4)
 
+    # 출력용 필드 — rank_candidates는 선택된 상위 후보에만 이 함수를 호출
+    label1 = n1.get("label", "")
+    label2 = n2.get("label", "")
     return {
         "from":               n1["id"],
         "to":                 n2["id"],
-        "from_label":         n1.get("label", "")[:40],
-        "to_label":           n2.get("label", "")[:40],
+        "from_label":         label1[:40],
+        "to_label":           label2[:40],
         "from_type":          n1.get("type", ""),
         "to_type":            n2.get("type", ""),
         "from_source":        n1.get("source", ""),
@@ -274,67 +401,165 @@ def score_pair_v4(n1: dict, n2: dict, max_node_id: int, kg_stdev: float, kg_mean
         "semantic_score":     semantic,
         "combined":           combined,
         "suggested_relation": relation,
-        "suggested_label":    f"{n1.get('label','')[:25]}↔{n2.get('label','')[:25]}",
+        "suggested_label":    f"{label1[:25]}↔{label2[:25]}",
     }
 
 
-def rank_candidates(kg: dict) -> list:
+def scan_pairs(nids: array, src_code: array, tcode: array, dci_tbl: list,
+               existing: set, max_nid: int, top_n: int = None) -> tuple:
+    """
+    쌍 스캔 커널 — 사전 계산된 노드 정수 컬럼만 받아 combined_v4를 계산.
+    dict 접근·함수 호출 없이 인덱스 조회와 산술만 수행하고, 전역/메서드는 지역 변수로 바인딩.
+
+    src_code: SRC_CODE 기반 출처 코드 (0=기타)
+    dci_tbl[a][b]: 타입 코드 쌍이 DCI feeding 관계인지 (bool) — 전부 False면 쌍별 검사 생략
+    existing: 이미 연결된 노드 쌍 — 정규화 키 i * n + j (i < j, 노드 인덱스)
+    top_n: 지정 시 크기 K 최소 힙만 유지 — 루트가 현재 K위(최약) 후보, 전체 풀은 저장 안 함
+    반환: (ranked, (cross, same, filtered_dci)) — ranked는 (combined, -i, -j) 내림차순
+    """
+    w_span, w_age, w_cross = W_EDGE_SPAN, W_NODE_AGE, W_CROSS
+    heappush, heapreplace = heapq.heappush, heapq.heapreplace
+    n_cross = n_same = n_dci = 0
+    ranked = []
+    # infer_relation이 DCI feeding 관계를 resonates_with로 치환하므로 보통 해당 타입 쌍이 없음
+    check_dci = any(any(row) for row in dci_tbl)
+
+    # node_num 오름차순 정렬 → 고정된 a에 대해 span은 b가 커질수록 단조 증가.
+    # bisect로 span >= MIN_SPAN이 되는 첫 b부터만 순회 (MIN_SPAN 미만 쌍은 아예 생성 안 함)
+    order = sorted(range(len(nids)), key=nids.__getitem__)
+    nums  = array("q", [nids[k] for k in order])
+    n     = len(order)
+
+    # combined는 (cross_flag, span)에만 의존 — span은 0..max_span 정수이므로
+    # round 포함 점수를 span별로 한 번만 계산해두고 쌍 루프에서는 표 조회만
+    max_span = nums[-1] - nums[0] if n else 0
+    esn_tbl    = [s / max_nid if max_nid > 0 else 0.0 for s in range(max_span + 1)]
+    comb_same  = [round(w_span * esn + w_age * esn + w_cross * 0.0, 4) for esn in esn_tbl]
+    comb_cross = [round(w_span * esn + w_age * esn + w_cross * 1.0, 4) for esn in esn_tbl]
+
+    for a in range(n):
+        num_a = nums[a]
+        for b in range(bisect_left(nums, num_a + MIN_SPAN, a + 1), n):
+            # 원래 KG 순서 유지 (from/to 방향 + 동점 정렬 순서)
+            i, j = order[a], order[b]
+            if i > j:
+                i, j = j, i
+            if i * n + j in existing:
+                continue
+
+            # DCI feeding 필터 (관계는 두 타입에만 의존)
+            if check_dci and dci_tbl[tcode[i]][tcode[j]]:
+                n_dci += 1
+                continue
+
+            c1, c2 = src_code[i], src_code[j]
+            if c1 != c2 and c1 and c2:
+                n_cross += 1
+                combined = comb_cross[nums[b] - num_a]
+            else:
+                n_same += 1
+                combined = comb_same[nums[b] - num_a]
+
+            item = (combined, -i, -j)   # 동점이면 KG 순서가 앞선 쌍이 우선
+            if top_n is None:
+                ranked.append(item)
+            elif len(ranked) < top_n:
+                heappush(ranked, item)
+            elif ranked and item > ranked[0]:
+                heapreplace(ranked, item)
+
+    ranked.sort(reverse=True)
+    return ranked, (n_cross, n_same, n_dci)
+
+
+def rank_candidates(kg: dict, top_n: int = None, stats: dict = None) -> list:
     """
     v4 후보 랭킹.
     CSER 제약 없음. DCI feeding 관계만 필터.
     min_semantic 없음 (edge_span이 기준).
+
+    top_n: 지정 시 상위 top_n개만 스캔 중 부분 선택해 반환 (O(P log K), 메모리 O(K))
+    stats: 지정 시 후보 풀 집계(cross/same/filtered_dci)를 채워 돌려줌
     """
     nodes      = [n for n in kg["nodes"] if n["id"].startswith("n-")]
-    max_nid    = max(node_num(n["id"]) for n in nodes)
-    nids       = [node_num(n["id"]) for n in nodes]
-    kg_stdev   = statistics.stdev(nids) if len(nids) > 1 else 1.0
-    kg_mean    = statistics.mean(nids)
+    # id 문자열 파싱은 노드당 1회 — 박싱된 int 리스트 대신 연속 정수 배열 (8B/노드)
+    nids       = array("q", map(node_num, (n["id"] for n in nodes)))
+    max_nid    = max(nids)
 
+    # 기존 엣지: 방향 무관 정규화 키 (i < j) 하나만 저장 — (from,to)/(to,from) 이중 저장 X
+    n_nodes = len(nodes)
+    idx     = {n["id"]: k for k, n in enumerate(nodes)}
     existing = set()
     for e in kg["edges"]:
-        existing.add((e["from"], e["to"]))
-        existing.add((e["to"],   e["from"]))
-
-    candidates = []
-    stats = {"cross": 0, "same": 0, "filtered_dci": 0}
-
-    for n1, n2 in combinations(nodes, 2):
-        if (n1["id"], n2["id"]) in existing:
-            continue
-        span = abs(node_num(n1["id"]) - node_num(n2["id"]))
-        if span < MIN_SPAN:
+        i, j = idx.get(e["from"]), idx.get(e["to"])
+        if i is None or j is None:
             continue
+        existing.add(i * n_nodes + j if i < j else j * n_nodes + i)
 
-        scored = score_pair_v4(n1, n2, max_nid, kg_stdev, kg_mean)
+    # 노드별 컬럼 1회 계산 — 쌍 루프에서는 인덱스 조회만
+    src_code = array("B", [SRC_CODE.get(n.get("source", ""), 0) for n in nodes])
+    type_idx, compat_tbl, rel_tbl = build_type_tables(nodes)
+    tcode    = array("H", [type_idx[n.get("type", "")] for n in nodes])
+    dci_tbl  = [[rel in DCI_FEEDING_RELATIONS for rel, _ in row] for row in rel_tbl]
 
-        # DCI feeding 필터
-        if scored["suggested_relation"] in DCI_FEEDING_RELATIONS:
-            stats["filtered_dci"] += 1
-            continue
+    # 1단계: combined_v4 수치 성분만 계산
+    ranked, (n_cross, n_same, n_dci) = scan_pairs(
+        nids, src_code, tcode, dci_tbl, existing, max_nid, top_n,
+    )
+    if stats is None:
+        stats = {}
+    stats.update(cross=n_cross, same=n_same, filtered_dci=n_dci)
+
+    print_pool_stats(stats)
+
+    # 2단계: 토큰화/자카드/출력 dict 구성은 선택된 쌍에만.
+    # 노드 특징은 노드당 1회만 계산 (쌍마다 재토큰화 X)
+    feats = [None] * len(nodes)
+    vocab = tag_vocab(nodes)
+
+    def feat(k: int) -> tuple:
+        if feats[k] is None:
+            feats[k] = node_features(nodes[k], vocab)
+        return feats[k]
+
+    return [
+        score_pair_v4(nodes[-ni], nodes[-nj], max_nid, feat(-ni), feat(-nj),
+                      compat_tbl[tcode[-ni]][tcode[-nj]], rel_tbl[tcode[-ni]][tcode[-nj]][0],
+                      nids[-ni], nids[-nj])
+        for _, ni, nj in ranked
+    ]
 
-        if scored["cross_source"]:
-            stats["cross"] += 1
-        else:
-            stats["same"] += 1
 
-        candidates.append(scored)
+# ─── E_v4 / E_v3 delta 측정 ───────────────────────────────────────────────────
 
-    print(f"  📊 후보 풀 — 교차출처: {stats['cross']}개 / 동일출처: {stats['same']}개"
-          f"  (DCI 필터: {stats['filtered_dci']}개 제외)")
+_METRICS = None  # src.metrics 모듈 — --add 경로에서만 필요하므로 최초 사용 시 로드
 
-    candidates.sort(key=lambda x: -x["combined"])
-    return candidates
 
+def _metrics():
+    global _METRICS
+    if _METRICS is None:
+        try:
+            from src import metrics
+        except ImportError:
+            # 스크립트 직접 실행 시 REPO가 sys.path에 없음 — 한 번만 추가
+            sys.path.insert(0, str(REPO))
+            from src import metrics
+        _METRICS = metrics
+    return _METRICS
 
-# ─── E_v4 / E_v3 delta 측정 ───────────────────────────────────────────────────
 
-def compute_delta(kg: dict, additions: list) -> dict:
-    sys.path.insert(0, str(REPO))
-    from src.metrics import compute_all_metrics
+def compute_delta(kg: dict, additions: list, before: dict = None) -> dict:
+    """
+    additions 적용 전후 메트릭 비교.
+    before: 동일 kg에 대해 이미 계산한 compute_all_metrics 결과 (배치 호출 시 재계산 생략)
 
-    before = compute_all_metrics(kg)
-    test_kg = {"nodes": kg["nodes"], "edges": kg["edges"] + additions}
-    after  = compute_all_metrics(test_kg)
+    after는 kg 복사/전체 재계산 대신 엣지별 누적 상태에 additions만 반영해 계산.
+    """
+    metrics = _metrics()
+    state   = metrics.metrics_state(kg)
+    if before is None:
+        before = metrics.compute_all_metrics_incremental(state, [])
+    after = metrics.compute_all_metrics_incremental(state, additions)
 
     ev4_before = before["E_v4"]
     ev3_before = before["E_v3"]
@@ -364,7 +589,7 @@ def compute_delta(kg: dict, additions: list) -> dict:
 
 # ─── KG에 추가 ────────────────────────────────────────────────────────────────
 
-def add_edges_to_kg(kg: dict, selected: list) -> tuple:
+def add_edges_to_kg(kg: dict, selected: list, before_metrics: dict = None) -> tuple:
     max_eid = max(
         (int(e["id"].replace("e-", ""))
          for e in kg["edges"]
@@ -392,35 +617,50 @@ def add_edges_to_kg(kg: dict, selected: list) -> tuple:
             },
         })
 
-    updated_kg = {"nodes": kg["nodes"], "edges": kg["edges"] + new_edges}
-    delta      = compute_delta(kg, new_edges)
-    return updated_kg, new_edges, delta
+    # delta는 추가 전 kg 기준 → 측정 후 제자리 extend (전체 엣지 리스트 복사 없음)
+    delta = compute_delta(kg, new_edges, before_metrics)
+    kg["edges"].extend(new_edges)
+    return kg, new_edges, delta
 
 
 # ─── 출력 ─────────────────────────────────────────────────────────────────────
 
-def print_recommendations(candidates: list, top_n: int) -> None:
+def print_pool_stats(stats: dict) -> None:
+    print(f"  📊 후보 풀 — 교차출처: {stats['cross']}개 / 동일출처: {stats['same']}개"
+          f"  (DCI 필터: {stats['filtered_dci']}개 제외)")
+
+
+def print_recommendations(candidates: list, top_n: int, total: int = None) -> None:
     n = min(top_n, len(candidates))
+    if total is None:
+        total = len(candidates)
     cross_n = sum(1 for c in candidates[:n] if c["cross_source"])
-    print("═══ pair_designer v4 — CSER 제약 제거 + edge_span 직접 최적화 (사이클 78) ═══")
-    print(f"후보: {len(candidates)}쌍  |  상위 {n}개")
-    print(f"combined_v4 = {W_EDGE_SPAN}×edge_span_norm + {W_NODE_AGE}×age_contrib + {W_CROSS}×cross_flag")
-    print(f"CSER 제약: 없음 (v3 역설 탈출)")
-    print(f"상위 {n}개 중 교차출처: {cross_n}개")
-    print()
+    # 후보당 print 7회 대신 한 번에 write (--top 대량 출력 시 syscall 감소)
+    parts = [
+        "═══ pair_designer v4 — CSER 제약 제거 + edge_span 직접 최적화 (사이클 78) ═══\n",
+        f"후보: {total}쌍  |  상위 {n}개\n",
+        f"combined_v4 = {W_EDGE_SPAN}×edge_span_norm + {W_NODE_AGE}×age_contrib + {W_CROSS}×cross_flag\n",
+        "CSER 제약: 없음 (v3 역설 탈출)\n",
+        f"상위 {n}개 중 교차출처: {cross_n}개\n",
+        "\n",
+    ]
 
     for i, c in enumerate(candidates[:n], 1):
         cross_tag = " [교차✓]" if c["cross_source"] else ""
-        print(f"  [{i:>2}] {c['from']}↔{c['to']}  combined={c['combined']:.4f}{cross_tag}")
-        print(f"       {c['from_type']:<12} ↔ {c['to_type']:<12}  span={c['span']}")
-        print(f"       edge_span_norm={c['edge_span_norm']:.4f}  semantic={c['semantic_score']:.4f}")
-        print(f"       \"{c['from_label']}\"")
-        print(f"       → [{c['suggested_relation']}]")
-        print(f"       \"{c['to_label']}\"")
-        print()
+        parts.append(
+            f"  [{i:>2}] {c['from']}↔{c['to']}  combined={c['combined']:.4f}{cross_tag}\n"
+            f"       {c['from_type']:<12} ↔ {c['to_type']:<12}  span={c['span']}\n"
+            f"       edge_span_norm={c['edge_span_norm']:.4f}  semantic={c['semantic_score']:.4f}\n"
+            f"       \"{c['from_label']}\"\n"
+            f"       → [{c['suggested_relation']}]\n"
+            f"       \"{c['to_label']}\"\n"
+            "\n"
+        )
+
+    if not total:
+        parts.append("  추천 없음\n")
 
-    if not candidates:
-        print("  추천 없음")
+    sys.stdout.write("".join(parts))
 
 
 def print_delta_report(delta: dict) -> None:
@@ -450,7 +690,10 @@ def print_delta_report(delta: dict) -> None:
 
 def main():
     args = sys.argv[1:]
-    kg   = load_kg()
+    data = KG_FILE.read_bytes()
+    kg   = _json_loads(data)
+    # 캐시는 --cache 일 때만 — 읽기 전용 실행이 사용자 캐시에 파일을 남기지 않도록
+    key  = _cache_key(data) if "--cache" in args else None
 
     top_n = 20
     add_n = 0
@@ -468,26 +711,37 @@ def main():
         if not log["sessions"]:
             print("기록 없음")
             return
-        print(json.dumps(log["sessions"][-1], ensure_ascii=False, indent=2))
+        sys.stdout.write(_json_dumps(log["sessions"][-1]))
         return
 
     print(f"  KG: {len(kg['nodes'])} 노드 / {len(kg['edges'])} 엣지")
     print(f"  모드: v4 (CSER 제약 없음 — edge_span 직접 최적화)\n")
 
-    candidates = rank_candidates(kg)
+    # KG 변경 없이 --cache로 반복 실행하면 캐시에서 바로 (save_kg 시 KG 내용 변경 → 자동 무효)
+    want = max(top_n, add_n)
+    cached = load_candidates(key, want) if key else None
+    if cached is not None:
+        candidates, pool = cached
+        print_pool_stats(pool)
+    else:
+        pool = {}
+        candidates = rank_candidates(kg, top_n=want, stats=pool)
+        if key:
+            save_candidates(key, want, candidates, pool)
+    total_pool = pool["cross"] + pool["same"]
 
     if "--json" in args:
-        print(json.dumps({
+        sys.stdout.write(_json_dumps({
             "version":    VERSION,
             "candidates": candidates[:top_n],
-            "total_pool": len(candidates),
+            "total_pool": total_pool,
             "params": {
                 "top_n":        top_n,
                 "W_EDGE_SPAN":  W_EDGE_SPAN,
                 "W_NODE_AGE":   W_NODE_AGE,
                 "W_CROSS":      W_CROSS,
             },
-        }, ensure_ascii=False, indent=2))
+        }))
         return
 
     if add_n > 0:
@@ -532,7 +786,7 @@ def main():
         print(f"  로그 → data/pair_designer_v4_log.json")
         return
 
-    print_recommendations(candidates, top_n)
+    print_recommendations(candidates, top_n, total_pool)
 
 
 if __name__ == "__main__":
@@ -592,7 +592,7 @@ def main():
         # v4 vs v5 비교: 동일 후보에 대해 두 점수 비교
         sys.path.insert(0, str(REPO))
         from src.pair_designer_v4 import rank_candidates as rank_v4
-        v4_candidates = rank_v4(kg)
+        v4_candidates = rank_v4(kg, top_n=10)   # 비교 출력은 상위 10개뿐 — 전체 풀 dict 구성 생략
         v5_candidates = candidates
 
         print("=== v4 vs v5 상위 10개 비교 ===\n")
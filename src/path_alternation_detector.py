@@ -23,17 +23,29 @@ n-052 실현: path_alternation_detector.py 구축 결정 — D-033×D-034 자동
   python path_alternation_detector.py save-node        # 탐지 결과를 KG 노드로 저장
 """
 
-import json
+import heapq
+import os
+import re
 import sys
 import argparse
-from collections import defaultdict, deque
-from itertools import combinations
+from array import array
+from collections import Counter, defaultdict, deque
+from functools import lru_cache, partial
+from multiprocessing import Pool
+from itertools import accumulate, combinations
 from pathlib import Path
 from datetime import datetime
 
 REPO_DIR = Path(__file__).parent.parent
 KG_FILE = REPO_DIR / "data" / "knowledge-graph.json"
 
+try:
+    from src.jsonio import json_dumps, json_loads   # orjson 우선, 어긋나는 값(NaN 등)은 표준 json
+except ImportError:
+    # 스크립트 직접 실행 시 REPO가 sys.path에 없음
+    sys.path.insert(0, str(REPO_DIR))
+    from src.jsonio import json_dumps, json_loads
+
 # 출처 정규화 — cokac-bot, cokac → 'cokac' / 록이, 상록 → '록이'
 SOURCE_ALIAS = {
     "cokac-bot": "cokac",
@@ -44,18 +56,22 @@ SOURCE_ALIAS = {
 
 # 갭 27 관련 노드 (n-040~n-050 범위, 갭 27 관련 레이블 포함)
 GAP27_KEYWORDS = ["갭 27", "gap27", "큰 도약", "지연 수렴", "DCI", "법칙화"]
+# 키워드 K개를 한 번의 스캔으로 검사 (kw in text를 키워드마다 반복하지 않음)
+GAP27_RE = re.compile("|".join(re.escape(kw) for kw in GAP27_KEYWORDS))
+
+# 이보다 작은 그래프는 프로세스 기동·결과 전송 비용이 BFS보다 큼 → 순차 탐색
+PARALLEL_MIN_NODES = 200
 
 
 # ─── I/O ─────────────────────────────────────────────────────────────────────
 
 def load_kg():
-    with open(KG_FILE) as f:
-        return json.load(f)
+    return json_loads(KG_FILE.read_bytes())
 
 def save_kg(kg):
-    with open(KG_FILE, "w") as f:
-        json.dump(kg, f, ensure_ascii=False, indent=2)
+    KG_FILE.write_bytes(json_dumps(kg))
 
+@lru_cache(maxsize=256)   # 출처 종류는 십여 개 — source_map 밖(predict 등)의 반복 호출도 해시 조회 1회
 def normalize_source(raw: str) -> str:
     return SOURCE_ALIAS.get(raw, raw)
 
@@ -63,111 +79,342 @@ def normalize_source(raw: str) -> str:
 # ─── 그래프 구조 구축 ─────────────────────────────────────────────────────────
 
 def build_graph(kg):
-    """인접 리스트(양방향)와 노드 인덱스 구축"""
+    """
+    노드 인덱스 + 무방향 그래프(CSR 정수 배열) + 노드별 정규화 출처 구축.
+
+    graph = (ids, indptr, nbrs, src_code)
+      ids[i]      = node id (엣지에만 등장하는 id는 노드 뒤에 붙음, 출처 "?")
+      nbrs[indptr[i]:indptr[i+1]] = 노드 i의 이웃 인덱스 (엣지 순서·중복 유지)
+      src_code[i] = 정규화 출처의 정수 코드
+    노드별 (to_id, edge) 튜플 리스트 대신 연속 int 배열 두 개 — BFS는 엣지 객체를 쓰지 않는다.
+
+    Returns: (nodes_index, graph, src_of)
+    """
     nodes = {n["id"]: n for n in kg["nodes"]}
-    adj = defaultdict(list)  # from_id -> [(to_id, edge), ...]
+    src_of = source_map(nodes)
+
+    ids = list(nodes)
+    idx = {nid: i for i, nid in enumerate(ids)}
+    ends = array("i")  # 엣지별 (from, to) 인덱스 평탄화
     for e in kg["edges"]:
-        adj[e["from"]].append((e["to"], e))
-        adj[e["to"]].append((e["from"], e))  # 무방향 탐색
-    return nodes, adj
+        for nid in (e["from"], e["to"]):
+            i = idx.get(nid)
+            if i is None:
+                i = idx[nid] = len(ids)
+                ids.append(nid)
+            ends.append(i)
+
+    # 차수 → indptr, 엣지 순서대로 양쪽 끝에 채움 (무방향 탐색)
+    deg = [0] * (len(ids) + 1)
+    for i in ends:
+        deg[i + 1] += 1
+    indptr = array("i", accumulate(deg))
+    fill = list(indptr)
+    nbrs = array("i", bytes(4 * len(ends)))
+    for k in range(0, len(ends), 2):
+        a, b = ends[k], ends[k + 1]
+        nbrs[fill[a]] = b
+        fill[a] += 1
+        nbrs[fill[b]] = a
+        fill[b] += 1
+
+    codes = {}
+    src_code = array("i", [codes.setdefault(src_of.get(nid, "?"), len(codes)) for nid in ids])
+    return nodes, (ids, indptr, nbrs, src_code), src_of
+
+
+def source_map(nodes_index):
+    """노드 id → 정규화 출처 (경로마다 재정규화하지 않도록 1회 계산)"""
+    return {
+        nid: normalize_source(n.get("source", n.get("created_by", "?")))
+        for nid, n in nodes_index.items()
+    }
 
 
 # ─── 교대 점수 계산 ───────────────────────────────────────────────────────────
 
-def alternation_score(path_nodes, nodes_index):
+def alternation_score(path_nodes, src_of):
     """
     출처 교대 점수: 연속 노드 쌍에서 출처가 바뀐 비율
     score = 교대 횟수 / (경로 길이 - 1)
     완전 교대(록이→cokac→록이) = 1.0
     완전 단일 = 0.0
+    src_of: build_graph()의 노드 id → 정규화 출처
     """
     if len(path_nodes) < 2:
         return 0.0
-    sources = [normalize_source(nodes_index[nid].get("source", nodes_index[nid].get("created_by", "?")))\
-               for nid in path_nodes]
+    sources = [src_of[nid] for nid in path_nodes]
     transitions = sum(1 for a, b in zip(sources, sources[1:]) if a != b)
     return transitions / (len(sources) - 1)
 
 
-def alternation_pattern(path_nodes, nodes_index):
+def alternation_pattern(path_nodes, src_of):
     """출처 시퀀스 문자열 반환: 록이→cokac→록이→cokac"""
-    sources = [normalize_source(nodes_index[nid].get("source", nodes_index[nid].get("created_by", "?"))) \
-               for nid in path_nodes]
-    return "→".join(sources)
+    return "→".join([src_of[nid] for nid in path_nodes])
 
 
 # ─── BFS 경로 탐색 ───────────────────────────────────────────────────────────
 
-def find_all_paths(nodes_index, adj, max_depth=6, max_paths=500):
+def _bfs_kernel(indptr, nbrs, src_code, starts, max_depth, max_paths, min_score, unique=False):
+    """
+    정수 BFS 커널 — 노드·출처 모두 정수라 문자열 해싱/딕셔너리 조회 없이 리스트 인덱싱만.
+    상태 k: node_of[k] = 현재 노드 인덱스, parent_of[k] = 이전 상태 (-1 = 시작),
+            depth_of[k] = 경로 노드 수, trans_of[k] = 시작부터의 출처 교대 횟수
+    unique: 무방향 탐색은 A→…→C와 C→…→A를 모두 찾는다 — 시작 < 끝(노드 인덱스)인 방향만 기록
+    """
+    node_of, parent_of, depth_of, trans_of = [], [], [], []
+    hits = []
+    limit = float("inf") if max_paths is None else max_paths
+    # 깊이 d, 교대 t인 상태의 자손 점수 상한 = (t + max_depth - d) / (max_depth - 1)
+    prune = max_paths is None and min_score > 0 and max_depth >= 2
+    need = min_score * (max_depth - 1)
+
+    add_node, add_parent = node_of.append, parent_of.append
+    add_depth, add_trans, add_hit = depth_of.append, trans_of.append, hits.append
+    n_states = 0
+    # 큐 하나를 전체 탐색에 재사용 — 시작 노드 BFS가 끝나면 큐는 항상 비어 있다.
+    # (모든 시작점을 한꺼번에 넣는 super-source BFS는 시작점 간 순서가 섞여 max_paths 컷이 달라짐)
+    queue = deque()
+    push, pop = queue.append, queue.popleft
+
+    # 각 노드에서 시작
+    for start in starts:
+        if len(hits) >= limit:
+            break
+        add_node(start)
+        add_parent(-1)
+        add_depth(1)
+        add_trans(0)
+        push(n_states)
+        n_states += 1
+        while queue and len(hits) < limit:
+            k = pop()
+            depth = depth_of[k]
+            if depth >= 2 and (not unique or start < node_of[k]):
+                add_hit(k)
+            if depth >= max_depth:
+                continue
+            cur = node_of[k]
+            cur_src = src_code[cur]
+            trans_k = trans_of[k]
+            for nxt in nbrs[indptr[cur]:indptr[cur + 1]]:
+                p = k
+                while p >= 0 and node_of[p] != nxt:
+                    p = parent_of[p]
+                if p >= 0:  # 이미 경로에 있는 노드
+                    continue
+                trans = trans_k + (src_code[nxt] != cur_src)
+                if prune and trans + max_depth - depth - 1 < need:
+                    continue
+                add_node(nxt)
+                add_parent(k)
+                add_depth(depth + 1)
+                add_trans(trans)
+                push(n_states)
+                n_states += 1
+
+    return node_of, parent_of, depth_of, trans_of, hits
+
+
+_WORKER_GRAPH = None
+
+
+def _init_worker(indptr, nbrs, src_code):
+    global _WORKER_GRAPH
+    _WORKER_GRAPH = (indptr, nbrs, src_code)
+
+
+def _bfs_chunk(starts, max_depth, min_score, unique):
+    """워커: 시작 노드 구간 하나를 BFS — 상태는 구간 내 상대 번호, int 배열로 반환 (전송 비용 절감)"""
+    indptr, nbrs, src_code = _WORKER_GRAPH
+    states = _bfs_kernel(indptr, nbrs, src_code, starts, max_depth, None, min_score, unique)
+    return tuple(array("i", col) for col in states)
+
+
+def _bfs_parallel(indptr, nbrs, src_code, starts, max_depth, min_score, unique, workers):
+    """
+    시작 노드별 BFS는 서로 독립 — 구간으로 나눠 프로세스 풀에서 탐색하고 시작 순서대로 이어 붙인다.
+    (경로 수 제한이 없을 때만 사용: 제한이 있으면 앞쪽 시작 노드 몇 개로 끝나 병렬 이득이 없음)
+    """
+    chunk = max(1, len(starts) // (workers * 8))
+    chunks = [starts[lo:lo + chunk] for lo in range(0, len(starts), chunk)]
+    node_of, parent_of, depth_of, trans_of, hits = [], [], [], [], []
+    work = partial(_bfs_chunk, max_depth=max_depth, min_score=min_score, unique=unique)
+    with Pool(workers, initializer=_init_worker, initargs=(indptr, nbrs, src_code)) as pool:
+        for p_node, p_parent, p_depth, p_trans, p_hits in pool.imap(work, chunks):
+            base = len(node_of)
+            node_of.extend(p_node)
+            parent_of.extend([p + base if p >= 0 else -1 for p in p_parent])
+            depth_of.extend(p_depth)
+            trans_of.extend(p_trans)
+            hits.extend([k + base for k in p_hits])
+    return node_of, parent_of, depth_of, trans_of, hits
+
+
+def _bfs_states(nodes_index, graph, max_depth=6, max_paths=500, min_score=0.0, workers=None,
+                unique=False):
+    """
+    부모 포인터 BFS — 경로를 복사하지 않고 상태를 평탄한 배열에 쌓는다.
+    방문 검사는 visited 집합 대신 부모 체인을 거슬러 확인 (depth ≤ 7이라 집합 복사보다 저렴).
+
+    max_paths=None이면 경로 수 제한 없이 전부 탐색하고, 남은 깊이를 모두 교대로 채워도
+    min_score에 못 미치는 분기는 큐에 넣지 않는다. 제한이 있으면 잘린 분기도 BFS 순서상
+    max_paths 자리를 차지하므로 결과가 달라지지 않도록 가지치기하지 않는다.
+    workers: 제한 없는 탐색의 프로세스 수 (None = CPU 수, 1 = 순차)
+    unique: 역방향 중복 경로(A→B→C / C→B→A) 중 한 방향만 기록 — max_paths도 서로 다른 경로 수 기준.
+            끝 노드 방향을 쓰는 predict에는 부적합해 기본값은 양방향 유지
+
+    Returns: (ids, node_of, parent_of, depth_of, trans_of, hits)
+      — node_of는 ids 인덱스, hits = 길이 2 이상 경로의 상태 번호 (BFS 순서)
+    """
+    ids, indptr, nbrs, src_code = graph
+    # 이웃이 없는 노드에서 시작한 BFS는 길이 2 이상 경로를 만들지 못함 → 시작점에서 제외
+    # (차수 1 노드는 제외하지 않음: 잎-잎 경로 L1→A→L2는 잎에서 시작할 때만 나온다)
+    starts = [s for s in range(len(nodes_index)) if indptr[s + 1] > indptr[s]]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if max_paths is None and workers > 1 and len(starts) >= PARALLEL_MIN_NODES:
+        return (ids,) + _bfs_parallel(
+            indptr, nbrs, src_code, starts, max_depth, min_score, unique, workers
+        )
+    return (ids,) + _bfs_kernel(
+        indptr, nbrs, src_code, starts, max_depth, max_paths, min_score, unique
+    )
+
+
+def _path_of(k, ids, node_of, parent_of):
+    """상태 k의 부모 체인 → 시작 노드부터의 node-id 리스트"""
+    path = []
+    while k >= 0:
+        path.append(ids[node_of[k]])
+        k = parent_of[k]
+    path.reverse()
+    return path
+
+
+def find_all_paths(nodes_index, graph, max_depth=6, max_paths=500, unique=False):
     """
     BFS로 모든 경로 탐색.
     n-047 자기수정 교훈: depth 3 제한이 경로 없음 오류의 원인이었다.
     → 기본값 6으로 더 깊게 탐색.
 
+    unique=True면 역방향 중복 경로는 한 번만.
+
     Returns: list of node-id lists
     """
-    all_paths = []
-    node_ids = list(nodes_index.keys())
+    ids, node_of, parent_of, _, _, hits = _bfs_states(
+        nodes_index, graph, max_depth, max_paths, unique=unique
+    )
+    return [_path_of(k, ids, node_of, parent_of) for k in hits]
 
-    # 각 노드에서 시작
-    for start in node_ids:
-        queue = deque([(start, [start], {start})])
-        while queue and len(all_paths) < max_paths:
-            cur, path, visited = queue.popleft()
-            if len(path) >= 2:
-                all_paths.append(list(path))
-            if len(path) >= max_depth:
-                continue
-            for nxt, _ in adj[cur]:
-                if nxt not in visited:
-                    queue.append((nxt, path + [nxt], visited | {nxt}))
 
-    return all_paths
+def scan_alternation(kg, max_depth=7, max_paths=1000, min_score=0.0, workers=None,
+                     unique=False):
+    """
+    교대 경로 BFS 1회 — 길이/점수 필터 전 상태를 그대로 반환.
+    여러 임계값으로 재필터할 때 BFS를 반복하지 않도록 select_alternation_paths()와 분리.
+    min_score: max_paths=None일 때 가지치기 기준 (이보다 낮은 임계값으로는 재필터 불가)
+
+    Returns: (nodes_index, src_of, states) — states = _bfs_states() 결과
+    """
+    nodes_index, graph, src_of = build_graph(kg)
+    states = _bfs_states(
+        nodes_index, graph,
+        max_depth=max_depth, max_paths=max_paths, min_score=min_score, workers=workers,
+        unique=unique,
+    )
+    return nodes_index, src_of, states
 
 
-def find_alternation_paths(kg, min_length=3, min_score=0.5, max_depth=7, max_paths=1000):
+def select_alternation_paths(scan, min_length=3, min_score=0.5, top_k=None):
     """
-    교대 경로 탐지 메인 함수.
-    min_length: 경로 최소 노드 수
-    min_score: 최소 교대 점수
+    scan_alternation() 결과 → 길이/점수 필터를 통과한 교대 경로 (점수 내림차순).
+    교대 점수는 BFS 상태에 누적된 교대 횟수로 바로 계산 — 필터를 통과한 경로만 리스트로 만든다.
+    top_k: 지정 시 크기 K 최소 힙으로 상위 K개만 유지하고, 살아남은 경로만 리스트로 만든다
+           (키 = (점수, 길이, -BFS 순서) — 전체 정렬 후 앞 K개와 같은 결과)
     """
-    nodes_index, adj = build_graph(kg)
-    all_paths = find_all_paths(nodes_index, adj, max_depth=max_depth, max_paths=max_paths)
+    _, src_of, (ids, node_of, parent_of, depth_of, trans_of, hits) = scan
 
-    results = []
-    for path in all_paths:
-        if len(path) < min_length:
+    ranked = []   # (round 점수, 길이, -BFS 순서, 상태 번호)
+    for order, k in enumerate(hits):
+        length = depth_of[k]
+        if length < min_length:
             continue
-        score = alternation_score(path, nodes_index)
+        score = trans_of[k] / (length - 1)
         if score < min_score:
             continue
-        pattern = alternation_pattern(path, nodes_index)
+        item = (round(score, 3), length, -order, k)
+        if top_k is None:
+            ranked.append(item)
+        elif len(ranked) < top_k:
+            heapq.heappush(ranked, item)
+        elif ranked and item > ranked[0]:
+            heapq.heapreplace(ranked, item)
+
+    # 점수 내림차순 정렬 (동점: 길이 내림차순 → BFS 순서)
+    ranked.sort(reverse=True)
+    results = []
+    for score, length, _, k in ranked:
+        path = _path_of(k, ids, node_of, parent_of)
         results.append({
             "path": path,
-            "score": round(score, 3),
-            "pattern": pattern,
-            "length": len(path),
+            "score": score,
+            "pattern": alternation_pattern(path, src_of),
+            "length": length,
         })
+    return results
 
-    # 점수 내림차순 정렬
-    results.sort(key=lambda x: (-x["score"], -x["length"]))
-    return results, nodes_index
+
+def find_alternation_paths(kg, min_length=3, min_score=0.5, max_depth=7, max_paths=1000,
+                           workers=None, top_k=None, unique=False):
+    """
+    교대 경로 탐지 메인 함수.
+    min_length: 경로 최소 노드 수
+    min_score: 최소 교대 점수
+    max_paths: BFS 경로 수 상한 (None = 제한 없음 + 점수 상한 가지치기)
+    workers: 제한 없는 탐색을 나눌 프로세스 수 (None = CPU 수)
+    top_k: 상위 K개만 필요할 때 — 전체 정렬 대신 크기 K 힙
+    unique: 역방향 중복 경로를 한 번만 (점수는 방향과 무관 — 채점·정렬·출력 작업 절반)
+
+    Returns: (results, nodes_index)
+    정규화 출처 맵(src_of)까지 필요하면 scan_alternation() + select_alternation_paths()
+    """
+    scan = scan_alternation(kg, max_depth=max_depth, max_paths=max_paths, min_score=min_score,
+                            workers=workers, unique=unique)
+    return select_alternation_paths(scan, min_length, min_score, top_k), scan[0]
+
+
+@lru_cache(maxsize=1)
+def _cached_scan(kg_mtime_ns, max_depth):
+    # 캐시된 kg는 명령 사이에 공유된다 — 수정하려면 load_kg()로 새로 읽을 것
+    kg = load_kg()
+    return kg, scan_alternation(kg, max_depth=max_depth)
+
+
+def load_and_select(min_length, min_score, max_depth=7, top_k=None):
+    """
+    CLI 공용 — KG 로드 + BFS는 KG mtime별 1회, 명령별 임계값은 재필터만.
+    (기본 실행은 stats → predict 두 명령을 연달아 수행)
+
+    Returns: (kg, results, nodes_index, src_of) — kg는 캐시 공유 객체이므로 읽기 전용
+    """
+    kg, scan = _cached_scan(KG_FILE.stat().st_mtime_ns, max_depth)
+    nodes_index, src_of, _ = scan
+    return kg, select_alternation_paths(scan, min_length, min_score, top_k), nodes_index, src_of
 
 
 # ─── 갭 27 상관관계 ──────────────────────────────────────────────────────────
 
 def find_gap27_nodes(kg):
     """갭 27 관련 노드 탐지"""
-    gap_nodes = []
-    for n in kg["nodes"]:
-        label = n.get("label", "")
-        content = n.get("content", "")
-        if any(kw in label or kw in content for kw in GAP27_KEYWORDS):
-            gap_nodes.append(n["id"])
-    return gap_nodes
+    search = GAP27_RE.search
+    return [
+        n["id"] for n in kg["nodes"]
+        if search(n.get("label", "")) or search(n.get("content", ""))
+    ]
 
 
-def correlate_with_gap27(alternation_results, gap27_ids, nodes_index):
+def correlate_with_gap27(alternation_results, gap27_ids):
     """교대 경로 중 갭 27 노드를 포함하는 경로 필터링"""
     gap_set = set(gap27_ids)
     correlated = []
@@ -181,7 +428,7 @@ def correlate_with_gap27(alternation_results, gap27_ids, nodes_index):
 
 # ─── 창발 예측 ───────────────────────────────────────────────────────────────
 
-def predict_emergence(alternation_results, nodes_index, top_n=5):
+def predict_emergence(alternation_results, nodes_index, src_of, top_n=5):
     """
     교대 경로 끝 노드 = 다음 창발 후보.
 
@@ -201,7 +448,7 @@ def predict_emergence(alternation_results, nodes_index, top_n=5):
         candidates.append({
             "node_id": nid,
             "label": node.get("label", ""),
-            "source": normalize_source(node.get("source", node.get("created_by", "?"))),
+            "source": src_of.get(nid, "?"),
             "emergence_prob": round(avg_score * len(scores) / top_n, 3),
             "path_count": len(scores),
             "avg_alternation": round(avg_score, 3),
@@ -213,37 +460,35 @@ def predict_emergence(alternation_results, nodes_index, top_n=5):
 
 # ─── 통계 ─────────────────────────────────────────────────────────────────────
 
-def compute_stats(alternation_results, kg, nodes_index):
+def compute_stats(alternation_results, kg, src_of):
     """교대 패턴 통계"""
     if not alternation_results:
         return {}
 
     scores = [r["score"] for r in alternation_results]
-    patterns = defaultdict(int)
+    patterns = Counter()
+    src = src_of.__getitem__
     for r in alternation_results:
-        # 패턴 요약 (2-gram)
-        srcs = r["pattern"].split("→")
-        for a, b in zip(srcs, srcs[1:]):
-            if a != b:
-                key = f"{a}→{b}"
-                patterns[key] += 1
+        # 패턴 요약 (2-gram) — 패턴 문자열을 다시 split하지 않고 출처 쌍 튜플로 집계
+        srcs = list(map(src, r["path"]))
+        patterns.update(zip(srcs, srcs[1:]))
+    for key in [k for k in patterns if k[0] == k[1]]:   # 같은 출처 연속은 전이 아님
+        del patterns[key]
 
     total_nodes = len(kg["nodes"])
     total_edges = len(kg["edges"])
 
-    # 출처별 노드 수
-    source_counts = defaultdict(int)
-    for n in kg["nodes"]:
-        src = normalize_source(n.get("source", n.get("created_by", "?")))
-        source_counts[src] += 1
+    # 출처별 노드 수 — src_of(스캔과 함께 캐시됨)를 Counter 한 번에 통과
+    source_counts = Counter(map(src_of.__getitem__, [n["id"] for n in kg["nodes"]]))
 
     return {
         "total_alternation_paths": len(alternation_results),
         "avg_score": round(sum(scores) / len(scores), 3),
         "max_score": round(max(scores), 3),
         "perfect_alternation": sum(1 for s in scores if s == 1.0),
-        "top_transitions": sorted(patterns.items(), key=lambda x: -x[1])[:5],
-        "source_distribution": dict(source_counts),
+        # 동점은 처음 등장 순 (sorted와 동일), 문자열화는 상위 5개만
+        "top_transitions": [(f"{a}→{b}", c) for (a, b), c in patterns.most_common(5)],
+        "source_distribution": source_counts,
         "kg_nodes": total_nodes,
         "kg_edges": total_edges,
     }
@@ -251,7 +496,7 @@ def compute_stats(alternation_results, kg, nodes_index):
 
 # ─── KG에 결과 저장 ──────────────────────────────────────────────────────────
 
-def save_detection_node(kg, alternation_results, stats, nodes_index):
+def save_detection_node(kg, alternation_results, stats):
     """탐지 결과를 KG 노드로 저장"""
     now = datetime.now().strftime("%Y-%m-%d")
     top = alternation_results[0] if alternation_results else {}
@@ -294,11 +539,11 @@ def save_detection_node(kg, alternation_results, stats, nodes_index):
 # ─── 출력 포맷 ───────────────────────────────────────────────────────────────
 
 def fmt_path(path, nodes_index):
-    return " → ".join(
-        f"{nid}({nodes_index[nid].get('label','')[:20]}...)" if len(nodes_index[nid].get('label','')) > 20
-        else f"{nid}({nodes_index[nid].get('label','')})"
-        for nid in path
-    )
+    parts = []
+    for nid in path:
+        label = nodes_index[nid].get("label", "")   # 노드당 조회 1회
+        parts.append(f"{nid}({label[:20]}...)" if len(label) > 20 else f"{nid}({label})")
+    return " → ".join(parts)
 
 
 # ─── CLI ─────────────────────────────────────────────────────────────────────
@@ -309,7 +554,8 @@ def cmd_detect(args):
     print(f"   KG: {len(kg['nodes'])} nodes / {len(kg['edges'])} edges\n")
 
     results, nodes_index = find_alternation_paths(
-        kg, min_length=args.min_len, min_score=args.min_score, max_depth=args.max_depth
+        kg, min_length=args.min_len, min_score=args.min_score, max_depth=args.max_depth,
+        max_paths=args.max_paths or None, workers=args.workers, unique=args.unique,
     )
 
     if not results:
@@ -323,9 +569,7 @@ def cmd_detect(args):
 
 
 def cmd_top(args):
-    kg = load_kg()
-    results, nodes_index = find_alternation_paths(kg, min_length=3, min_score=0.0, max_depth=7)
-    results.sort(key=lambda x: -x["score"])
+    _, results, nodes_index, _ = load_and_select(min_length=3, min_score=0.0, top_k=args.n)
 
     print(f"🏆 교대 점수 Top {args.n}\n")
     for i, r in enumerate(results[:args.n], 1):
@@ -336,9 +580,10 @@ def cmd_top(args):
 
 
 def cmd_predict(args):
-    kg = load_kg()
-    results, nodes_index = find_alternation_paths(kg, min_length=3, min_score=0.5, max_depth=7)
-    candidates = predict_emergence(results, nodes_index, top_n=args.top)
+    # predict_emergence는 상위 top×10개 경로만 사용
+    _, results, nodes_index, src_of = load_and_select(min_length=3, min_score=0.5,
+                                                      top_k=args.top * 10)
+    candidates = predict_emergence(results, nodes_index, src_of, top_n=args.top)
 
     print(f"🔮 창발 예측 — 다음 갭 27 후보 Top {args.top}\n")
     print("  가설: 교대 점수 높은 경로의 terminal 노드에서 다음 도약이 발생한다\n")
@@ -351,10 +596,9 @@ def cmd_predict(args):
 
 
 def cmd_correlate(args):
-    kg = load_kg()
-    results, nodes_index = find_alternation_paths(kg, min_length=3, min_score=0.3, max_depth=7)
+    kg, results, nodes_index, _ = load_and_select(min_length=3, min_score=0.3)
     gap27_ids = find_gap27_nodes(kg)
-    correlated = correlate_with_gap27(results, gap27_ids, nodes_index)
+    correlated = correlate_with_gap27(results, gap27_ids)
 
     print(f"⚡ 갭 27 상관관계 분석\n")
     print(f"   갭 27 관련 노드: {gap27_ids}")
@@ -369,9 +613,8 @@ def cmd_correlate(args):
 
 
 def cmd_stats(args):
-    kg = load_kg()
-    results, nodes_index = find_alternation_paths(kg, min_length=2, min_score=0.0, max_depth=7)
-    stats = compute_stats(results, kg, nodes_index)
+    kg, results, nodes_index, src_of = load_and_select(min_length=2, min_score=0.0)
+    stats = compute_stats(results, kg, src_of)
 
     print("📊 교대 패턴 통계\n")
     print(f"  KG: {stats['kg_nodes']} nodes / {stats['kg_edges']} edges")
@@ -380,7 +623,7 @@ def cmd_stats(args):
     print(f"  최대 교대 점수: {stats['max_score']}")
     print(f"  완전 교대 경로 (score=1.0): {stats['perfect_alternation']}")
     print(f"\n  출처 분포:")
-    for src, cnt in sorted(stats["source_distribution"].items(), key=lambda x: -x[1]):
+    for src, cnt in stats["source_distribution"].most_common():
         print(f"    {src}: {cnt}개 노드")
     print(f"\n  상위 전이 패턴:")
     for pat, cnt in stats["top_transitions"]:
@@ -388,10 +631,10 @@ def cmd_stats(args):
 
 
 def cmd_save_node(args):
-    kg = load_kg()
-    results, nodes_index = find_alternation_paths(kg, min_length=3, min_score=0.5, max_depth=7)
-    stats = compute_stats(results, kg, nodes_index)
-    new_id, node = save_detection_node(kg, results, stats, nodes_index)
+    kg, results, nodes_index, src_of = load_and_select(min_length=3, min_score=0.5)
+    stats = compute_stats(results, kg, src_of)
+    kg = load_kg()   # 캐시된 kg는 건드리지 않고 새로 읽은 사본에 노드 추가
+    new_id, node = save_detection_node(kg, results, stats)
     save_kg(kg)
     print(f"✅ KG에 저장 완료: {new_id}")
     print(f"   레이블: {node['label']}")
@@ -409,6 +652,12 @@ def main():
     p_detect.add_argument("--min-len", type=int, default=3, help="최소 경로 길이 (기본 3)")
     p_detect.add_argument("--min-score", type=float, default=0.5, help="최소 교대 점수 (기본 0.5)")
     p_detect.add_argument("--max-depth", type=int, default=7, help="최대 탐색 깊이 (기본 7)")
+    p_detect.add_argument("--max-paths", type=int, default=1000,
+                          help="BFS 경로 수 상한 (기본 1000, 0 = 제한 없음)")
+    p_detect.add_argument("--workers", type=int, default=None,
+                          help="제한 없는 탐색의 프로세스 수 (기본 CPU 수)")
+    p_detect.add_argument("--unique", action="store_true",
+                          help="역방향 중복 경로(A→B→C / C→B→A)는 한 번만")
 
     # top
     p_top = sub.add_parser("top", help="교대 점수 Top N")
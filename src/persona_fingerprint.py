@@ -24,15 +24,22 @@ D-036 이후 다음 질문: 페르소나 지문이 시간에 따라 진화하는
   python persona_fingerprint.py divergence   # 두 페르소나 간 거리
 """
 
-import json
 import sys
 import math
 from pathlib import Path
 from collections import defaultdict, Counter
+from functools import lru_cache
 
 REPO_DIR = Path(__file__).parent.parent
 KG_FILE = REPO_DIR / "data" / "knowledge-graph.json"
 
+try:
+    from src.jsonio import json_loads   # orjson 우선, 거부 입력(NaN 등)은 표준 json 으로 재시도
+except ImportError:
+    # 스크립트 직접 실행 시 REPO가 sys.path에 없음
+    sys.path.insert(0, str(REPO_DIR))
+    from src.jsonio import json_loads
+
 SOURCE_ALIAS = {
     "cokac-bot": "cokac",
     "cokac": "cokac",
@@ -42,16 +49,44 @@ SOURCE_ALIAS = {
 
 
 def load_kg():
-    with open(KG_FILE) as f:
-        return json.load(f)
+    return json_loads(KG_FILE.read_bytes())
 
 
+@lru_cache(maxsize=256)   # 노드마다 호출되지만 출처 종류는 십여 개
 def normalize(s):
     return SOURCE_ALIAS.get(s, s)
 
 
-def compute_fingerprint(nodes, edges, source_filter=None):
-    """에이전트 페르소나 지문 계산"""
+def node_num(nid):
+    """n-NNN → NNN. 사이클 번호가 없는 id(n-execloop-075 등)는 None"""
+    # 접두사만 잘라냄 — replace()는 id 전체를 훑고 중간의 "n-"까지 지운다
+    try:
+        return int(nid[2:] if nid.startswith("n-") else nid)
+    except ValueError:
+        return None
+
+
+def index_edges(nodes, edges):
+    """
+    KG 1회 순회로 엣지 인덱스 구축 — compute_fingerprint가 호출마다 전체 엣지를 훑지 않도록.
+      out[id]       = id에서 나가는 엣지 번호 리스트 (edges 순서)
+      in_degree[id] = id로 들어오는 엣지 수
+      src[id]       = 정규화 출처 (교차 소스 판정용)
+    """
+    out = defaultdict(list)
+    in_degree = Counter()
+    for i, e in enumerate(edges):
+        out[e.get("from", "")].append(i)
+        in_degree[e.get("to", "")] += 1
+    src = {n["id"]: normalize(n.get("source", "unknown")) for n in nodes}
+    return {"out": out, "in_degree": in_degree, "src": src}
+
+
+def compute_fingerprint(nodes, edges, source_filter=None, edge_index=None):
+    """
+    에이전트 페르소나 지문 계산
+    edge_index: index_edges(전체 노드, edges) 결과 — 여러 번 호출하는 명령에서 1회 구축해 전달
+    """
     if source_filter:
         target_nodes = [n for n in nodes if normalize(n.get("source", "")) == source_filter]
     else:
@@ -60,26 +95,47 @@ def compute_fingerprint(nodes, edges, source_filter=None):
     if not target_nodes:
         return None
 
-    target_ids = {n["id"] for n in target_nodes}
+    # 대상 노드 1회 순회로 id / 타입 / 태그 집계
+    target_ids = set()
+    type_dist = Counter()
+    tag_counts = Counter()
+    for n in target_nodes:
+        target_ids.add(n["id"])
+        type_dist[n.get("type", "unknown")] += 1
+        tag_counts.update(n.get("tags", []))
 
     # 1. 노드 타입 분포
-    type_dist = Counter(n.get("type", "unknown") for n in target_nodes)
     total_nodes = len(target_nodes)
     type_vec = {t: c / total_nodes for t, c in type_dist.items()}
 
     # 2. 관계 타입 분포 (아웃바운드 엣지)
-    out_edges = [e for e in edges if e.get("from", "") in target_ids]
+    if edge_index is None:
+        out_edges = [e for e in edges if e.get("from", "") in target_ids]
+    else:
+        # 노드별 엣지 번호를 합쳐 정렬 → 전체 스캔과 같은 엣지 순서 (Counter 순서/동점 유지)
+        out_by_id = edge_index["out"]
+        out_edges = [edges[i] for i in sorted(
+            i for nid in target_ids if nid in out_by_id for i in out_by_id[nid]
+        )]
     rel_dist = Counter(e.get("relation", "unknown") for e in out_edges)
     total_rels = len(out_edges) if out_edges else 1
     rel_vec = {r: c / total_rels for r, c in rel_dist.items()}
 
     # 3. 연결 밀도
-    in_edges = [e for e in edges if e.get("to", "") in target_ids]
+    if edge_index is None:
+        n_in = sum(1 for e in edges if e.get("to", "") in target_ids)
+    else:
+        in_degree = edge_index["in_degree"]
+        n_in = sum(in_degree[nid] for nid in target_ids if nid in in_degree)
     avg_out_degree = len(out_edges) / total_nodes
-    avg_in_degree = len(in_edges) / total_nodes
+    avg_in_degree = n_in / total_nodes
 
-    # 4. 교차 소스 비율
-    all_node_src = {n["id"]: normalize(n.get("source", "unknown")) for n in nodes}
+    # 4. 교차 소스 비율 (대상: 넘겨받은 nodes 안의 노드만)
+    if edge_index is None:
+        all_node_src = {n["id"]: normalize(n.get("source", "unknown")) for n in nodes}
+    else:
+        src = edge_index["src"]
+        all_node_src = {n["id"]: src[n["id"]] for n in nodes}
     cross_edges = [
         e for e in out_edges
         if e.get("to", "") in all_node_src
@@ -88,10 +144,7 @@ def compute_fingerprint(nodes, edges, source_filter=None):
     cross_ratio = len(cross_edges) / len(out_edges) if out_edges else 0
 
     # 5. 태그 다양성
-    all_tags = []
-    for n in target_nodes:
-        all_tags.extend(n.get("tags", []))
-    tag_entropy = _entropy(Counter(all_tags))
+    tag_entropy = _entropy(tag_counts)
 
     return {
         "source": source_filter,
@@ -118,14 +171,15 @@ def _entropy(counter):
 
 
 def cosine_similarity(vec_a, vec_b):
-    """두 벡터의 코사인 유사도"""
-    keys = set(vec_a.keys()) | set(vec_b.keys())
-    a = [vec_a.get(k, 0) for k in keys]
-    b = [vec_b.get(k, 0) for k in keys]
-
-    dot = sum(x * y for x, y in zip(a, b))
-    mag_a = math.sqrt(sum(x ** 2 for x in a))
-    mag_b = math.sqrt(sum(x ** 2 for x in b))
+    """
+    두 벡터의 코사인 유사도 (희소 dict 벡터)
+    한쪽에만 있는 키는 내적에 0 기여 — 공통 키만 곱하고, 크기는 각자의 값으로 계산
+    """
+    if len(vec_b) < len(vec_a):
+        vec_a, vec_b = vec_b, vec_a
+    dot = sum(x * vec_b[k] for k, x in vec_a.items() if k in vec_b)
+    mag_a = math.sqrt(sum(x * x for x in vec_a.values()))
+    mag_b = math.sqrt(sum(x * x for x in vec_b.values()))
 
     if mag_a == 0 or mag_b == 0:
         return 0.0
@@ -136,7 +190,9 @@ def split_by_era(nodes, early_cutoff=15, late_start=45):
     """초기 / 중기 / 최근 노드 분리"""
     early, mid, late = [], [], []
     for n in nodes:
-        nid = int(n["id"].replace("n-", ""))
+        nid = node_num(n["id"])
+        if nid is None:
+            continue
         if nid <= early_cutoff:
             early.append(n)
         elif nid >= late_start:
@@ -149,12 +205,13 @@ def split_by_era(nodes, early_cutoff=15, late_start=45):
 def cmd_print(kg):
     nodes = kg["nodes"]
     edges = kg["edges"]
+    edge_index = index_edges(nodes, edges)
 
     print("=" * 55)
     print("🔬 페르소나 지문 (현재 전체)")
     print("=" * 55)
     for source in ["록이", "cokac"]:
-        fp = compute_fingerprint(nodes, edges, source)
+        fp = compute_fingerprint(nodes, edges, source, edge_index)
         if not fp:
             continue
         print(f"\n【{source}】 ({fp['node_count']} 노드)")
@@ -167,6 +224,7 @@ def cmd_print(kg):
 def cmd_compare(kg):
     nodes = kg["nodes"]
     edges = kg["edges"]
+    edge_index = index_edges(nodes, edges)
     early_nodes, _, late_nodes = split_by_era(nodes)
 
     print("=" * 55)
@@ -176,8 +234,8 @@ def cmd_compare(kg):
     print("=" * 55)
 
     for source in ["록이", "cokac"]:
-        fp_early = compute_fingerprint(early_nodes, edges, source)
-        fp_late = compute_fingerprint(late_nodes, edges, source)
+        fp_early = compute_fingerprint(early_nodes, edges, source, edge_index)
+        fp_late = compute_fingerprint(late_nodes, edges, source, edge_index)
 
         if not fp_early or not fp_late:
             print(f"\n【{source}】 데이터 부족")
@@ -202,18 +260,28 @@ def cmd_timeline(kg):
     print("📈 사이클별 페르소나 지문 변화 (window=10)")
     print("=" * 55)
 
+    edge_index = index_edges(nodes, edges)
+
     window = 10
-    all_ids = sorted(int(n["id"].replace("n-", "")) for n in nodes)
-    max_id = all_ids[-1]
+    # 노드를 윈도우별로 1회 분배 — 윈도우마다 전체 노드를 다시 훑고 id를 재파싱하지 않음
+    buckets = defaultdict(list)
+    max_id = 0
+    for n in nodes:
+        num = node_num(n["id"])
+        if num is None:
+            continue
+        max_id = max(max_id, num)
+        if num >= 1:
+            buckets[(num - 1) // window].append(n)
 
     for start in range(1, max_id, window):
         end = start + window - 1
-        window_nodes = [n for n in nodes if start <= int(n["id"].replace("n-", "")) <= end]
+        window_nodes = buckets.get((start - 1) // window, [])
         if len(window_nodes) < 3:
             continue
 
-        r_fp = compute_fingerprint(window_nodes, edges, "록이")
-        c_fp = compute_fingerprint(window_nodes, edges, "cokac")
+        r_fp = compute_fingerprint(window_nodes, edges, "록이", edge_index)
+        c_fp = compute_fingerprint(window_nodes, edges, "cokac", edge_index)
 
         r_cross = r_fp["cross_source_ratio"] if r_fp else 0
         c_cross = c_fp["cross_source_ratio"] if c_fp else 0
@@ -227,8 +295,9 @@ def cmd_divergence(kg):
     nodes = kg["nodes"]
     edges = kg["edges"]
 
-    fp_r = compute_fingerprint(nodes, edges, "록이")
-    fp_c = compute_fingerprint(nodes, edges, "cokac")
+    edge_index = index_edges(nodes, edges)
+    fp_r = compute_fingerprint(nodes, edges, "록이", edge_index)
+    fp_c = compute_fingerprint(nodes, edges, "cokac", edge_index)
 
     if not fp_r or not fp_c:
         print("데이터 부족")
@@ -31,8 +31,10 @@ trigger_batch.py (prism-insight) 출력 구조:
 """
 
 import math
+import re
 import sys
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
 # emergent_selector는 src/ 안에 있으므로 같은 디렉토리에서 직접 임포트
@@ -44,6 +46,9 @@ except ImportError:
     sys.path.insert(0, os.path.dirname(__file__))
     from emergent_selector import MacroSignal, TechnicalSignal, select_emergent_stocks, ConvictionResult
 
+# 종목마다 만드는 *Signal은 위치 인자로 생성한다 (키워드 바인딩 비용 제거).
+# 필드 순서 (emergent_selector): ticker, signal_type, direction, strength, reason, timestamp, weight
+
 
 # ─── 수출 섹터 정의 (D-061 기준) ─────────────────────────────────────────────
 
@@ -52,6 +57,22 @@ EXPORT_SECTORS = {"반도체", "자동차", "화학", "조선", "기계", "철
 # USD/KRW 수출 우호 임계값
 USD_KRW_EXPORT_THRESHOLD = 1400.0
 
+# us_futures 방향 → 매크로 신호 강도 배율 (그 외 방향은 1.0)
+US_FUTURES_BOOST = {"bullish": 1.10, "bearish": 0.95}
+
+# us_futures 방향 → 글로벌 매크로 신호 (strength, reason) — 종목과 무관한 상수
+GLOBAL_MACRO_SIGNALS = {
+    "bullish": (0.55, "미 선물 강세 → 위험선호 심리 유입"),
+    "bearish": (0.50, "미 선물 약세 → 위험회피 심리 → 외국인 매도 우려"),
+}
+
+# trigger_batch 결과 키 → (TechnicalSignal 타입, 근거 텍스트) — D-061 변환 규칙
+TRIGGER_SIGNAL_SPECS = (
+    ("volume_surge",       "거래량", "trigger_batch: volume_surge — 거래량 급증 모멘텀"),
+    ("gap_up_momentum",    "OHLCV",  "trigger_batch: gap_up — 갭상승 + 상승 모멘텀 지속"),
+    ("value_to_cap_ratio", "이평선", "trigger_batch: value_to_cap — 저평가 대비 시가총액 모멘텀"),
+)
+
 
 # ─── 스코어 정규화 ─────────────────────────────────────────────────────────────
 
@@ -65,10 +86,13 @@ def normalize_scores(series) -> "Series":
         s = pd.to_numeric(series, errors="coerce").fillna(0.0)
         s_min, s_max = s.min(), s.max()
         if s_max == s_min:
-            return s.map(lambda _: 0.5)
-        normalized = (s - s_min) / (s_max - s_min)
-        # [0.1, 1.0] 범위로 스케일
-        return 0.1 + normalized * 0.9
+            return pd.Series(0.5, index=s.index, dtype="float64", name=s.name)
+        # [0.1, 1.0] 범위로 스케일 — ndarray 하나에 in-place 연산 (중간 Series 생성 없음)
+        arr = s.to_numpy(dtype="float64") - s_min
+        arr /= s_max - s_min
+        arr *= 0.9
+        arr += 0.1
+        return pd.Series(arr, index=s.index, name=s.name)
     except Exception:
         return series
 
@@ -103,6 +127,37 @@ def _get_sector_col(df) -> Optional[str]:
     return None
 
 
+def _df_tickers(df) -> list:
+    """ticker 컬럼(없으면 index)을 str 리스트로 한 번에 꺼낸다."""
+    ticker_col = _get_ticker_col(df)
+    values = df[ticker_col].tolist() if ticker_col else df.index.tolist()
+    return [str(t) for t in values]
+
+
+def _match_sectors(sectors, names) -> set:
+    """
+    sectors 중 names 어느 하나와 (대소문자 무시) 양방향 부분문자열로 겹치는 섹터 집합.
+    종목 수가 아니라 고유 섹터 수만큼만 비교한다 (섹터 ≪ 종목).
+    """
+    lowered = tuple(n.lower() for n in names)
+    if not lowered:
+        return set()
+    contains_name = _names_pattern(lowered).search
+    matched = set()
+    for sector in sectors:
+        sl = sector.lower()
+        # 정방향(이름 ⊂ 섹터)은 정규식 한 번, 역방향(섹터 ⊂ 이름)만 파이썬 루프
+        if contains_name(sl) or any(sl in n for n in lowered):
+            matched.add(sector)
+    return matched
+
+
+@lru_cache(maxsize=32)
+def _names_pattern(lowered: tuple):
+    """이름 중 하나라도 부분문자열로 들어 있는지 한 번에 찾는 정규식 (이름 목록별 1회 컴파일)."""
+    return re.compile("|".join(map(re.escape, lowered)))
+
+
 # ─── 핵심 변환 함수 ────────────────────────────────────────────────────────────
 
 def _df_to_technical_signals(
@@ -111,6 +166,7 @@ def _df_to_technical_signals(
     reason_template: str,
     direction: str = "bullish",
     timestamp: Optional[str] = None,
+    tickers: Optional[list] = None,
 ) -> list:
     """
     trigger_batch DataFrame 한 종류를 TechnicalSignal 리스트로 변환.
@@ -121,48 +177,33 @@ def _df_to_technical_signals(
         reason_template: 신호 근거 텍스트 템플릿 (ticker placeholder 없음)
         direction:       신호 방향 (기본값: "bullish" — trigger_batch는 매수 신호 위주)
         timestamp:       ISO 타임스탬프 (없으면 현재 시각)
+        tickers:         _df_tickers()로 미리 꺼낸 ticker 리스트 (없으면 여기서 추출)
     """
     if df is None or len(df) == 0:
         return []
 
     ts = timestamp or datetime.now().isoformat()
-    signals = []
 
-    ticker_col = _get_ticker_col(df)
     score_col = _get_score_col(df)
 
     if score_col is None:
         return []
 
-    # 스코어 정규화
-    df = df.copy()
-    df["_norm_strength"] = normalize_scores(df[score_col])
+    if tickers is None:
+        tickers = _df_tickers(df)
 
-    for _, row in df.iterrows():
-        # ticker 추출
-        if ticker_col:
-            ticker = str(row[ticker_col])
-        else:
-            ticker = str(row.name)  # index를 ticker로 사용
+    # 스코어 정규화 — 입력 DataFrame은 건드리지 않으므로 복사본 불필요
+    # iterrows()는 행마다 Series를 만들어 느리다 → 컬럼을 한 번에 꺼내 zip
+    strengths = normalize_scores(df[score_col]).tolist()
 
-        strength = float(row["_norm_strength"])
-
-        signals.append(TechnicalSignal(
-            ticker=ticker,
-            signal_type=signal_type,
-            direction=direction,
-            strength=round(strength, 4),
-            reason=reason_template,
-            timestamp=ts,
-            weight=1.0,
-        ))
-
-    return signals
+    return [
+        TechnicalSignal(ticker, signal_type, direction, round(float(strength), 4), reason_template, ts, 1.0)
+        for ticker, strength in zip(tickers, strengths)
+    ]
 
 
 def _make_sector_macro_signals(
-    df_tickers: set,
-    sector_col_data: dict,  # {ticker: sector}
+    ticker_rows: list,  # [(ticker, sector)]
     hot_sectors: list,
     cold_sectors: list,
     timestamp: str,
@@ -172,43 +213,31 @@ def _make_sector_macro_signals(
     섹터 정보를 바탕으로 MacroSignal 생성.
     hot/cold 섹터 소속 여부로 방향과 강도를 결정.
     """
-    signals = []
-
-    for ticker in df_tickers:
-        sector = sector_col_data.get(ticker, "")
-
-        # hot 섹터 소속
-        if sector and any(h.lower() in sector.lower() or sector.lower() in h.lower()
-                          for h in hot_sectors):
-            signals.append(MacroSignal(
-                ticker=ticker,
-                signal_type="섹터",
-                direction="bullish",
-                strength=round(min(1.0, 0.8 * us_futures_boost), 4),
-                reason=f"hot 섹터({sector}) 포함 — 매크로 순풍",
-                timestamp=timestamp,
-                weight=1.2,  # 섹터 신호는 가중치 높임
-            ))
-
-        # cold 섹터 소속
-        elif sector and any(c.lower() in sector.lower() or sector.lower() in c.lower()
-                            for c in cold_sectors):
-            signals.append(MacroSignal(
-                ticker=ticker,
-                signal_type="섹터",
-                direction="bearish",
-                strength=round(min(1.0, 0.7 * us_futures_boost), 4),
-                reason=f"cold 섹터({sector}) 포함 — 매크로 역풍",
-                timestamp=timestamp,
-                weight=0.9,
-            ))
-
-    return signals
+    # 고유 섹터별 hot/cold 소속을 미리 판정 → 종목 루프는 dict 조회만
+    # 근거 텍스트도 섹터에만 의존 → 섹터별로 한 번만 포맷
+    sectors = {sector for _, sector in ticker_rows if sector}
+    hot_strength = round(min(1.0, 0.8 * us_futures_boost), 4)
+    cold_strength = round(min(1.0, 0.7 * us_futures_boost), 4)
+
+    # sector → (direction, strength, reason, weight). hot과 cold에 모두 걸리면 hot 우선
+    sector_info = {
+        s: ("bearish", cold_strength, f"cold 섹터({s}) 포함 — 매크로 역풍", 0.9)
+        for s in _match_sectors(sectors, cold_sectors)
+    }
+    sector_info.update(
+        (s, ("bullish", hot_strength, f"hot 섹터({s}) 포함 — 매크로 순풍", 1.2))  # 섹터 신호는 가중치 높임
+        for s in _match_sectors(sectors, hot_sectors)
+    )
+
+    return [
+        MacroSignal(ticker, "섹터", direction, strength, reason, timestamp, weight)
+        for ticker, sector in ticker_rows if sector in sector_info
+        for direction, strength, reason, weight in (sector_info[sector],)
+    ]
 
 
 def _make_export_macro_signals(
-    df_tickers: set,
-    sector_col_data: dict,  # {ticker: sector}
+    ticker_rows: list,  # [(ticker, sector)]
     usd_krw: float,
     timestamp: str,
 ) -> list:
@@ -220,32 +249,26 @@ def _make_export_macro_signals(
     if usd_krw <= USD_KRW_EXPORT_THRESHOLD:
         return []
 
-    signals = []
     excess_ratio = (usd_krw - USD_KRW_EXPORT_THRESHOLD) / USD_KRW_EXPORT_THRESHOLD
     # 1400원 초과분에 비례하여 strength 보정 (최대 0.95)
     base_strength = min(0.95, 0.75 + excess_ratio * 2)
+    strength = round(base_strength, 4)
 
-    for ticker in df_tickers:
-        sector = sector_col_data.get(ticker, "")
-        is_export = any(exp.lower() in sector.lower() or sector.lower() in exp.lower()
-                        for exp in EXPORT_SECTORS) if sector else False
-
-        if is_export:
-            signals.append(MacroSignal(
-                ticker=ticker,
-                signal_type="환율",
-                direction="bullish",
-                strength=round(base_strength, 4),
-                reason=f"USD/KRW={usd_krw:.0f} (>{USD_KRW_EXPORT_THRESHOLD:.0f}) → {sector} 수출 환차익",
-                timestamp=timestamp,
-                weight=1.1,
-            ))
+    # 환율 부분은 루프 불변 → 접두어를 한 번만 포맷하고 섹터별 근거만 붙인다
+    reason_prefix = f"USD/KRW={usd_krw:.0f} (>{USD_KRW_EXPORT_THRESHOLD:.0f}) →"
+    export_reasons = {
+        s: f"{reason_prefix} {s} 수출 환차익"
+        for s in _match_sectors({sector for _, sector in ticker_rows if sector}, EXPORT_SECTORS)
+    }
 
-    return signals
+    return [
+        MacroSignal(ticker, "환율", "bullish", strength, export_reasons[sector], timestamp, 1.1)
+        for ticker, sector in ticker_rows if sector in export_reasons
+    ]
 
 
 def _make_global_macro_signals(
-    df_tickers: set,
+    ticker_rows: list,  # [(ticker, sector)]
     us_futures: str,
     timestamp: str,
 ) -> list:
@@ -253,27 +276,16 @@ def _make_global_macro_signals(
     us_futures 방향으로 전체 종목에 글로벌 매크로 신호 추가.
     단독으로는 약하게 (strength 0.5~0.6), 다른 신호와 결합 시 창발 효과.
     """
-    if us_futures not in ("bullish", "bearish"):
+    if us_futures not in GLOBAL_MACRO_SIGNALS:
         return []
 
     direction = us_futures
-    strength = 0.55 if direction == "bullish" else 0.50
-    reason = (
-        "미 선물 강세 → 위험선호 심리 유입" if direction == "bullish"
-        else "미 선물 약세 → 위험회피 심리 → 외국인 매도 우려"
-    )
+    strength, reason = GLOBAL_MACRO_SIGNALS[direction]
 
     return [
-        MacroSignal(
-            ticker=ticker,
-            signal_type="글로벌",
-            direction=direction,
-            strength=strength,
-            reason=reason,
-            timestamp=timestamp,
-            weight=0.8,  # 글로벌 신호는 가중치 낮게 — 개별 섹터·환율 신호가 우선
-        )
-        for ticker in df_tickers
+        # weight 0.8: 글로벌 신호는 가중치 낮게 — 개별 섹터·환율 신호가 우선
+        MacroSignal(ticker, "글로벌", direction, strength, reason, timestamp, 0.8)
+        for ticker, _ in ticker_rows
     ]
 
 
@@ -320,70 +332,51 @@ def adapt_trigger_batch(
     cold_sectors = macro_context.get("cold_sectors", [])
 
     # us_futures bullish → 전체 매크로 신호 강도 10% 부스트
-    us_futures_boost = 1.10 if us_futures == "bullish" else (0.95 if us_futures == "bearish" else 1.0)
+    us_futures_boost = US_FUTURES_BOOST.get(us_futures, 1.0)
 
-    # ── 2. TechnicalSignal 변환 ───────────────────────────────────────────────
+    # ── 2+3. TechnicalSignal 변환 + sector 수집 (DataFrame당 한 번만 순회) ──
     technical_signals = []
-
-    df_volume = morning_results.get("volume_surge")
-    if df_volume is not None and len(df_volume) > 0:
-        technical_signals.extend(_df_to_technical_signals(
-            df_volume,
-            signal_type="거래량",
-            reason_template="trigger_batch: volume_surge — 거래량 급증 모멘텀",
-            timestamp=ts,
-        ))
-
-    df_gap = morning_results.get("gap_up_momentum")
-    if df_gap is not None and len(df_gap) > 0:
-        technical_signals.extend(_df_to_technical_signals(
-            df_gap,
-            signal_type="OHLCV",
-            reason_template="trigger_batch: gap_up — 갭상승 + 상승 모멘텀 지속",
-            timestamp=ts,
-        ))
-
-    df_value = morning_results.get("value_to_cap_ratio")
-    if df_value is not None and len(df_value) > 0:
-        technical_signals.extend(_df_to_technical_signals(
-            df_value,
-            signal_type="이평선",
-            reason_template="trigger_batch: value_to_cap — 저평가 대비 시가총액 모멘텀",
-            timestamp=ts,
-        ))
-
-    # ── 3. 전체 ticker + sector 수집 ─────────────────────────────────────────
-    all_tickers = {sig.ticker for sig in technical_signals}
     sector_map: dict[str, str] = {}  # {ticker: sector}
 
-    for df_key in ["volume_surge", "gap_up_momentum", "value_to_cap_ratio"]:
+    for df_key, signal_type, reason in TRIGGER_SIGNAL_SPECS:
         df = morning_results.get(df_key)
         if df is None or len(df) == 0:
             continue
+        tickers = _df_tickers(df)
+        technical_signals.extend(_df_to_technical_signals(
+            df,
+            signal_type=signal_type,
+            reason_template=reason,
+            timestamp=ts,
+            tickers=tickers,
+        ))
+
         sector_col = _get_sector_col(df)
-        ticker_col = _get_ticker_col(df)
         if sector_col is None:
             continue
-        for _, row in df.iterrows():
-            ticker = str(row[ticker_col]) if ticker_col else str(row.name)
-            if ticker not in sector_map and not _is_nan(row[sector_col]):
-                sector_map[ticker] = str(row[sector_col])
+        for ticker, sector in zip(tickers, df[sector_col].tolist()):
+            if ticker not in sector_map and not _is_nan(sector):
+                sector_map[ticker] = str(sector)
+
+    all_tickers = {sig.ticker for sig in technical_signals}
+    # (ticker, sector) 행을 한 번만 만들어 세 매크로 빌더가 공유 — 빌더마다 dict 조회 반복 없음
+    ticker_rows = [(ticker, sector_map.get(ticker, "")) for ticker in all_tickers]
 
     # ── 4. MacroSignal 생성 ───────────────────────────────────────────────────
     macro_signals = []
 
     # 4-A: 섹터 기반 신호 (hot/cold)
     macro_signals.extend(_make_sector_macro_signals(
-        all_tickers, sector_map, hot_sectors, cold_sectors, ts, us_futures_boost,
+        ticker_rows, hot_sectors, cold_sectors, ts, us_futures_boost,
     ))
 
     # 4-B: 환율 기반 수출주 신호
     macro_signals.extend(_make_export_macro_signals(
-        all_tickers, sector_map, usd_krw, ts,
+        ticker_rows, usd_krw, ts,
     ))
 
     # 4-C: 글로벌 매크로 (us_futures) — 보조 신호
-    macro_signals.extend(_make_global_macro_signals(all_tickers, us_futures, ts))
+    macro_signals.extend(_make_global_macro_signals(ticker_rows, us_futures, ts))
 
     # ── 5. emergent_selector 호출 ─────────────────────────────────────────────
     results = select_emergent_stocks(
@@ -397,10 +390,18 @@ def adapt_trigger_batch(
     return results
 
 
+_NAN_STRINGS = frozenset({"nan", "+nan", "-nan"})
+
+
 def _is_nan(val) -> bool:
     """NaN/None 체크 유틸."""
     if val is None:
         return True
+    # 흔한 경우(문자열 섹터, float)는 float() 변환·예외 처리 없이 바로 판정
+    if isinstance(val, str):
+        return val.strip().lower() in _NAN_STRINGS   # float("nan")처럼 "nan" 문자열은 결측
+    if isinstance(val, float):
+        return val != val
     try:
         return math.isnan(float(val))
     except (TypeError, ValueError):
@@ -409,6 +410,9 @@ def _is_nan(val) -> bool:
 
 # ─── 변환 요약 리포트 ──────────────────────────────────────────────────────────
 
+_DIRECTION_EMOJI = {"bullish": "📈", "bearish": "📉"}
+
+
 def print_adaptation_summary(
     morning_results: dict,
     macro_context: dict,
@@ -422,33 +426,40 @@ def print_adaptation_summary(
     usd_krw = macro_context.get("usd_krw", 0)
     us_futures = macro_context.get("us_futures", "neutral")
 
-    print("═══ prism_adapter — trigger_batch → emergent_selector 변환 요약 ═══")
-    print()
-    print(f"입력 신호:")
+    # 줄 단위 print 대신 리스트에 모아 한 번에 write (파이프 출력 시 flush 횟수 최소화)
+    lines = [
+        "═══ prism_adapter — trigger_batch → emergent_selector 변환 요약 ═══",
+        "",
+        "입력 신호:",
+    ]
     for name, df in morning_results.items():
         cnt = len(df) if df is not None else 0
-        print(f"  [{name}] {cnt}종목")
-    print()
-    print(f"매크로 컨텍스트:")
-    print(f"  USD/KRW: {usd_krw:.0f}  → 수출주 부스트: {'✓' if usd_krw > USD_KRW_EXPORT_THRESHOLD else '✗'}")
-    print(f"  미 선물: {us_futures}")
-    print(f"  hot 섹터: {macro_context.get('hot_sectors', [])}")
-    print(f"  cold 섹터: {macro_context.get('cold_sectors', [])}")
-    print()
-    print(f"출력: {len(results)}종목 선정 (창발 기준 통과)")
-    print()
+        lines.append(f"  [{name}] {cnt}종목")
+    lines += [
+        "",
+        "매크로 컨텍스트:",
+        f"  USD/KRW: {usd_krw:.0f}  → 수출주 부스트: {'✓' if usd_krw > USD_KRW_EXPORT_THRESHOLD else '✗'}",
+        f"  미 선물: {us_futures}",
+        f"  hot 섹터: {macro_context.get('hot_sectors', [])}",
+        f"  cold 섹터: {macro_context.get('cold_sectors', [])}",
+        "",
+        f"출력: {len(results)}종목 선정 (창발 기준 통과)",
+        "",
+    ]
 
     if not results:
-        print("  선정 종목 없음 (양쪽 관점 신호 동시 보유 종목 없음 — D-033 탈락)")
-        return
+        lines.append("  선정 종목 없음 (양쪽 관점 신호 동시 보유 종목 없음 — D-033 탈락)")
 
     for i, r in enumerate(results, 1):
-        dir_emoji = "📈" if r.direction == "bullish" else "📉" if r.direction == "bearish" else "↔️"
-        print(f"  [{i:>2}] {r.ticker}  {dir_emoji}  conviction_v2={r.final_score:.4f}")
-        print(f"       매크로 {r.macro_count}개 / 기술 {r.technical_count}개 | CSER_vol={r.cser_volume_adjusted:.4f}")
-        print(f"       \"{r.top_macro_reason[:55]}\"")
-        print(f"       \"{r.top_technical_reason[:55]}\"")
-        print()
+        dir_emoji = _DIRECTION_EMOJI.get(r.direction, "↔️")
+        lines.append(
+            f"  [{i:>2}] {r.ticker}  {dir_emoji}  conviction_v2={r.final_score:.4f}\n"
+            f"       매크로 {r.macro_count}개 / 기술 {r.technical_count}개 | CSER_vol={r.cser_volume_adjusted:.4f}\n"
+            f"       \"{r.top_macro_reason[:55]}\"\n"
+            f"       \"{r.top_technical_reason[:55]}\"\n"
+        )
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 # ─── 데모 / 테스트 ────────────────────────────────────────────────────────────
@@ -12,7 +12,6 @@ Usage:
     python pair_designer.py inject <ai_a> <ai_b> <seed_question>
 """
 
-import json
 import argparse
 import sys
 from pathlib import Path
@@ -21,28 +20,53 @@ from datetime import datetime
 ROOT = Path(__file__).parent.parent.parent
 KG_PATH = ROOT / "data" / "knowledge-graph.json"
 
+try:
+    from src.jsonio import json_dumps, json_loads   # orjson 우선, 어긋나는 값(NaN 등)은 표준 json
+except ImportError:
+    # 스크립트 직접 실행 시 ROOT가 sys.path에 없음
+    sys.path.insert(0, str(ROOT))
+    from src.jsonio import json_dumps, json_loads
+
 
 def load_kg():
-    return json.load(KG_PATH.open())
+    return json_loads(KG_PATH.read_bytes())
 
 
 def save_kg(kg):
-    with KG_PATH.open("w") as f:
-        json.dump(kg, f, ensure_ascii=False, indent=2)
+    KG_PATH.write_bytes(json_dumps(kg))
 
 
-def calc_emergence(kg):
-    """현재 KG의 창발 점수 계산 (edge-contribution 방식)"""
-    nodes = {n["id"]: n for n in kg["nodes"]}
-    total, count = 0.0, 0
+def _index_kg(kg):
+    """id → source 인덱스 — 명령마다 한 번만 만들어 함수들에 넘긴다."""
+    return {n["id"]: n["source"] for n in kg["nodes"]}
+
+
+def _id_num(item_id):
+    """'n-123' / 'e-045' → 123 / 45. 번호가 아닌 id(n-execloop-075 등)는 None."""
+    try:
+        return int(item_id.split("-")[1])
+    except (IndexError, ValueError):
+        return None
+
+
+def count_cross_edges(kg, node_source=None):
+    """(교차 엣지 수, 양 끝 노드가 모두 있는 엣지 수) — 엣지를 한 번만 훑는다."""
+    if node_source is None:
+        node_source = {n["id"]: n["source"] for n in kg["nodes"]}
+    cross, count = 0, 0
     for e in kg["edges"]:
-        src = nodes.get(e["from"])
-        tgt = nodes.get(e["to"])
-        if src and tgt:
-            span = 1.0 if src["source"] != tgt["source"] else 0.0
-            total += span
+        src, tgt = e["from"], e["to"]
+        if src in node_source and tgt in node_source:
             count += 1
-    return total / count if count > 0 else 0.0
+            if node_source[src] != node_source[tgt]:
+                cross += 1
+    return cross, count
+
+
+def calc_emergence(kg, node_source=None):
+    """현재 KG의 창발 점수 계산 (edge-contribution 방식)"""
+    cross, count = count_cross_edges(kg, node_source)
+    return cross / count if count > 0 else 0.0
 
 
 def cmd_design(ai_a: str, ai_b: str, seed: str):
@@ -96,33 +120,34 @@ def cmd_design(ai_a: str, ai_b: str, seed: str):
 def cmd_analyze():
     """현재 KG에서 초기 엣지 패턴 분석 (n-084 검증)"""
     kg = load_kg()
-    nodes = {n["id"]: n for n in kg["nodes"]}
+    node_source = _index_kg(kg)
     edges = kg["edges"]
 
-    # 엣지 번호 추출
-    def edge_num(e):
-        try:
-            return int(e["id"].split("-")[1])
-        except (IndexError, ValueError):
-            return 9999
-
-    scored = []
+    # 초기(e-001~e-030) vs 후기 — 엣지 한 번 순회로 개수·교차 수를 함께 센다
+    early_n = early_cross = late_n = late_cross = 0
+    cross_edges = []  # (엣지, 번호) — Top 10용 교차 엣지만 보관
     for e in edges:
-        src = nodes.get(e["from"])
-        tgt = nodes.get(e["to"])
-        if src and tgt:
-            span = 1.0 if src["source"] != tgt["source"] else 0.0
-            scored.append((e, span, edge_num(e)))
-
-    # 초기 vs 후기 비교
-    early = [s for s in scored if s[2] <= 30]
-    late  = [s for s in scored if s[2] > 30]
-
-    early_avg = sum(s[1] for s in early) / len(early) if early else 0
-    late_avg  = sum(s[1] for s in late)  / len(late)  if late  else 0
-
-    cross_early = [s for s in early if s[1] == 1.0]
-    cross_late  = [s for s in late  if s[1] == 1.0]
+        src, tgt = e["from"], e["to"]
+        if src not in node_source or tgt not in node_source:
+            continue
+        num = _id_num(e["id"])  # 엣지 번호 (번호 없는 id는 후기로 분류)
+        if num is None:
+            num = 9999
+        is_cross = node_source[src] != node_source[tgt]
+        if num <= 30:
+            early_n += 1
+            early_cross += is_cross
+        else:
+            late_n += 1
+            late_cross += is_cross
+        if is_cross:
+            cross_edges.append((e, num))
+
+    # span은 0/1이므로 평균 창발 기여 = 교차 비율, 전체 창발 = 전체 교차 비율
+    early_avg = early_cross / early_n if early_n else 0
+    late_avg  = late_cross / late_n   if late_n  else 0
+    linked = early_n + late_n
+    emergence = (early_cross + late_cross) / linked if linked > 0 else 0.0
 
     print(f"""
 ╔══════════════════════════════════════════════════════════════════╗
@@ -130,14 +155,14 @@ def cmd_analyze():
 ╚══════════════════════════════════════════════════════════════════╝
 
   전체 엣지: {len(edges)}개
-  현재 창발: {calc_emergence(kg):.4f}
+  현재 창발: {emergence:.4f}
 
   ── 초기 엣지 (e-001~e-030) ────────────────────────────────────
-    총 {len(early)}개 | 교차 엣지: {len(cross_early)}개 ({len(cross_early)/len(early)*100:.0f}%)
+    총 {early_n}개 | 교차 엣지: {early_cross}개 ({early_cross/early_n*100:.0f}%)
     평균 창발 기여: {early_avg:.4f}
 
   ── 후기 엣지 (e-031~) ─────────────────────────────────────────
-    총 {len(late)}개 | 교차 엣지: {len(cross_late)}개 ({len(cross_late)/len(late)*100:.0f}%)
+    총 {late_n}개 | 교차 엣지: {late_cross}개 ({late_cross/late_n*100:.0f}%)
     평균 창발 기여: {late_avg:.4f}
 
   ── n-084 검증 결과 ────────────────────────────────────────────
@@ -146,25 +171,21 @@ def cmd_analyze():
 """)
 
     # Top 10 교차 엣지 (번호 기준 초기 우선)
-    top10 = sorted([s for s in scored if s[1] == 1.0], key=lambda x: x[2])[:10]
+    top10 = sorted(cross_edges, key=lambda x: x[1])[:10]
     print(f"  Top 10 초기 교차 엣지:")
-    for e, span, num in top10:
-        src_ag = nodes.get(e["from"], {}).get("source", "?")
-        tgt_ag = nodes.get(e["to"], {}).get("source", "?")
+    for e, num in top10:
+        src_ag = node_source.get(e["from"], "?")
+        tgt_ag = node_source.get(e["to"], "?")
         print(f"    {e['id']}: [{src_ag}→{tgt_ag}] {e['label'][:55]}")
 
 
 def cmd_simulate(n_cross: int):
     """n개 교차 엣지 추가 시 창발 예측"""
     kg = load_kg()
-    nodes = {n["id"]: n for n in kg["nodes"]}
     current_edges = len(kg["edges"])
-    current_cross = sum(
-        1 for e in kg["edges"]
-        if nodes.get(e["from"], {}).get("source") != nodes.get(e["to"], {}).get("source")
-        and nodes.get(e["from"]) and nodes.get(e["to"])
-    )
-    current_emergence = calc_emergence(kg)
+    # 교차 엣지 수와 창발 점수를 같은 한 번의 순회에서 얻는다
+    current_cross, linked = count_cross_edges(kg)
+    current_emergence = current_cross / linked if linked > 0 else 0.0
 
     new_total = current_edges + n_cross
     new_cross = current_cross + n_cross
@@ -192,6 +213,7 @@ def cmd_simulate(n_cross: int):
 def cmd_inject(ai_a: str, ai_b: str, seed: str):
     """설계된 첫 10개 엣지를 실제 KG에 추가"""
     kg = load_kg()
+    node_source = _index_kg(kg)
     nodes_by_source = {}
     for n in kg["nodes"]:
         src = n["source"]
@@ -210,13 +232,24 @@ def cmd_inject(ai_a: str, ai_b: str, seed: str):
     a_latest = sorted(a_nodes, key=lambda x: x["id"])[-1]
     b_latest = sorted(b_nodes, key=lambda x: x["id"])[-1]
 
-    # 다음 노드 ID
-    existing_nums = [int(n["id"].split("-")[1]) for n in kg["nodes"] if "-" in n["id"]]
-    next_node_num = max(existing_nums) + 1 if existing_nums else 86
+    # 다음 노드 ID + n-085 노드를 노드 한 번 순회로 함께 구한다
+    # (n-execloop-075처럼 번호가 아닌 id는 번호 계산에서 제외)
+    max_node_num = None
+    n085_node = None
+    for n in kg["nodes"]:
+        num = _id_num(n["id"])
+        if num is not None and (max_node_num is None or num > max_node_num):
+            max_node_num = num
+        if n085_node is None and ("n-085" in n["id"] or "0.65+" in n.get("label", "")):
+            n085_node = n
+    next_node_num = max_node_num + 1 if max_node_num is not None else 86
 
     # 다음 엣지 ID
-    existing_edge_nums = [int(e["id"].split("-")[1]) for e in kg["edges"] if "-" in e["id"]]
-    next_edge_num = max(existing_edge_nums) + 1 if existing_edge_nums else 183
+    max_edge_num = max(
+        (num for num in map(_id_num, (e["id"] for e in kg["edges"])) if num is not None),
+        default=None,
+    )
+    next_edge_num = max_edge_num + 1 if max_edge_num is not None else 183
 
     ts = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
 
@@ -282,7 +315,6 @@ def cmd_inject(ai_a: str, ai_b: str, seed: str):
     next_edge_num += 1
 
     # ai_a → ai_b 방향: 제품이 n-085 예측 검증
-    n085_node = next((n for n in kg["nodes"] if "n-085" in n["id"] or "0.65+" in n.get("label", "")), None)
     if n085_node:
         e3 = {
             "id": f"e-{next_edge_num:03d}",
@@ -303,7 +335,8 @@ def cmd_inject(ai_a: str, ai_b: str, seed: str):
     print(f"    노드 추가: {len(new_nodes)}개 ({', '.join(n['id'] for n in new_nodes)})")
     print(f"    엣지 추가: {len(new_edges)}개 ({', '.join(e['id'] for e in new_edges)})")
     print(f"    총계: {len(kg['nodes'])}개 노드 / {len(kg['edges'])}개 엣지")
-    new_emergence = calc_emergence(kg)
+    node_source.update((n["id"], n["source"]) for n in new_nodes)
+    new_emergence = calc_emergence(kg, node_source)
     print(f"    새 창발: {new_emergence:.4f}")
     return new_nodes, new_edges
 
@@ -16,18 +16,53 @@ prophecy_check.py — 예언 검증기
 구현: cokac-bot (사이클 26) — n-038 예언 TRUE 검증 기념
 """
 
-import json, sys
+import re, sys
+from collections import Counter
 from pathlib import Path
 
 REPO = Path(__file__).parent.parent
 KG_FILE = REPO / "data" / "knowledge-graph.json"
 
+try:
+    from src.jsonio import JSON_ERRORS, json_dumps, json_load_file   # orjson 우선, 어긋나는 값은 표준 json
+except ImportError:
+    # 스크립트 직접 실행 시 REPO가 sys.path에 없음
+    sys.path.insert(0, str(REPO))
+    from src.jsonio import JSON_ERRORS, json_dumps, json_load_file
+
+# 빈 그래프로 대체하는 실패 — 파일 없음/읽기 불가(OSError), 깨진 JSON(JSON_ERRORS)
+_LOAD_ERRORS = (OSError,) + JSON_ERRORS
+
+# 라벨 속 신뢰도 표기 (예: "[55%]")
+_PCT_RE = re.compile(r"\[(\d+)%\]")
+
+ICONS = {"TRUE": "✅", "PARTIAL": "✨", "FALSE": "❌", "미결": "⏳"}
+
+_PREDICTS_FROM = sys.intern("predicts_from")
+
+
+def _intern_refs(kg):
+    """노드 id·엣지 from/to/relation 문자열을 intern — 같은 값이 같은 객체가 되어
+    dict 조회와 == 비교가 내용 비교 없이 포인터 일치로 끝난다."""
+    intern = sys.intern
+    for n in kg.get("nodes", []):
+        nid = n.get("id")
+        if type(nid) is str:
+            n["id"] = intern(nid)
+    for e in kg.get("edges", []):
+        for key in ("from", "to", "relation"):
+            v = e.get(key)
+            if type(v) is str:
+                e[key] = intern(v)
+    return kg
+
 
 def load_kg():
     try:
-        return json.loads(KG_FILE.read_text())
-    except Exception:
+        kg = json_load_file(KG_FILE)
+    except _LOAD_ERRORS:
         return {"nodes": [], "edges": []}
+    return _intern_refs(kg)
 
 
 def check_prophecies(kg):
@@ -40,11 +75,19 @@ def check_prophecies(kg):
     # predicts_from: prediction → question (무엇을 예측하는지)
     subject_map = {}    # pred_id → [subject_id, ...]
 
+    # 엣지 1회 순회 — 관계가 다르면 from/to 조회 없이 바로 건너뛴다
     for e in edges:
-        rel = e.get("relation", "")
-        src, tgt = e["from"], e["to"]
-        if rel == "predicts_from" and src in predictions:
-            subject_map.setdefault(src, []).append(tgt)
+        if e.get("relation") != _PREDICTS_FROM:
+            continue
+        src = e["from"]
+        if src in predictions:
+            subject_map.setdefault(src, []).append(e["to"])
+
+    # 예측 대상 라벨은 60자로 한 번만 잘라 둔다 — 여러 예언이 같은 대상을 가리켜도 재사용
+    trunc60 = {
+        s: node_map[s]["label"][:60]
+        for subjects in subject_map.values() for s in subjects if s in node_map
+    }
 
     results = []
     for pid, p in predictions.items():
@@ -63,9 +106,8 @@ def check_prophecies(kg):
 
         confidence_str = p.get("label", "")
 
-        # 라벨에서 신뢰도 숫자 추출 (예: "[55%]")
-        import re
-        pct_match = re.search(r'\[(\d+)%\]', confidence_str)
+        # 라벨에서 신뢰도 숫자 추출 (예: "[55%]") — "%]"가 없으면 정규식 생략
+        pct_match = _PCT_RE.search(confidence_str) if "%]" in confidence_str else None
         stated_confidence = int(pct_match.group(1)) / 100.0 if pct_match else None
 
         results.append({
@@ -76,10 +118,7 @@ def check_prophecies(kg):
             "verdict": verdict,
             "stated_confidence": stated_confidence,
             "note": p.get("note", ""),
-            "subjects": [
-                {"id": s, "label": node_map[s]["label"][:60] if s in node_map else "?"}
-                for s in subjects
-            ],
+            "subjects": [{"id": s, "label": trunc60.get(s, "?")} for s in subjects],
         })
 
     return results
@@ -105,13 +144,15 @@ def main():
     acc = score(results)
 
     if "--json" in sys.argv:
-        print(json.dumps({"accuracy": acc, "prophecies": results}, ensure_ascii=False, indent=2))
+        report = {"accuracy": acc, "prophecies": results}
+        sys.stdout.write(json_dumps(report, newline=True).decode())
         return
 
-    true_c  = sum(1 for r in results if r["verdict"] == "TRUE")
-    part_c  = sum(1 for r in results if r["verdict"] == "PARTIAL")
-    false_c = sum(1 for r in results if r["verdict"] == "FALSE")
-    pend_c  = sum(1 for r in results if r["verdict"] == "미결")
+    counts  = Counter(r["verdict"] for r in results)
+    true_c  = counts["TRUE"]
+    part_c  = counts["PARTIAL"]
+    false_c = counts["FALSE"]
+    pend_c  = counts["미결"]
 
     if "--score" in sys.argv:
         print(f"예언 적중률: {acc:.0%}  (TRUE {true_c} / PARTIAL {part_c} / FALSE {false_c} / 미결 {pend_c})")
@@ -121,7 +162,6 @@ def main():
     print("=" * 54)
     print(f"\n📊 점수: {acc:.1%}  (TRUE {true_c} | PARTIAL {part_c} | FALSE {false_c} | 미결 {pend_c})")
 
-    ICONS = {"TRUE": "✅", "PARTIAL": "✨", "FALSE": "❌", "미결": "⏳"}
     for r in results:
         icon = ICONS[r["verdict"]]
         conf = f"  [{r['stated_confidence']:.0%}]" if r["stated_confidence"] else ""
@@ -35,13 +35,22 @@ import os
 import sys
 import argparse
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
-from collections import defaultdict
+from collections import Counter, defaultdict
+from itertools import chain, combinations
 
 REPO_DIR = Path(__file__).parent.parent
 KG_FILE  = Path(os.environ.get("EMERGENT_KG_PATH", REPO_DIR / "data" / "knowledge-graph.json"))
 LOGS_DIR = REPO_DIR / "logs"
 
+try:
+    from src.jsonio import json_dumps, json_load_file, json_loads   # orjson 우선, 어긋나는 값은 표준 json
+except ImportError:
+    # 스크립트 직접 실행 시 REPO_DIR가 sys.path에 없음
+    sys.path.insert(0, str(REPO_DIR))
+    from src.jsonio import json_dumps, json_load_file, json_loads
+
 
 # ─── 데이터 로드 ────────────────────────────────────────────────────────────
 
@@ -59,8 +68,7 @@ def load_graph() -> dict:
     if not KG_FILE.exists():
         print(f"❌ 그래프 파일 없음: {KG_FILE}", file=sys.stderr)
         sys.exit(1)
-    with open(KG_FILE, encoding="utf-8") as f:
-        return _normalize_nodes(json.load(f))
+    return _normalize_nodes(json_load_file(KG_FILE))
 
 
 def save_graph(graph: dict) -> None:
@@ -68,81 +76,167 @@ def save_graph(graph: dict) -> None:
     graph["meta"]["total_nodes"]  = len(graph["nodes"])
     graph["meta"]["total_edges"]  = len(graph["edges"])
     graph["meta"]["last_editor"]  = "cokac"
-    with open(KG_FILE, "w", encoding="utf-8") as f:
-        json.dump(graph, f, ensure_ascii=False, indent=2)
-        f.write("\n")
+    # 표준 json 과 같은 바이트 (orjson 이 다르게 쓰는 NaN·큰 정수 등은 json 으로) — 한 번에 기록
+    KG_FILE.write_bytes(json_dumps(graph, newline=True))
 
 
 # ─── 분석 엔진 ──────────────────────────────────────────────────────────────
 
+_FUTURE_TAGS = frozenset({"future", "prediction", "vision", "roadmap"})
+# 질문에 응답한 것으로 보는 관계
+_ANSWER_RELS = frozenset({"answers", "explores", "investigates"})
+
+
 class GraphAnalyzer:
     def __init__(self, graph: dict):
         self.graph  = graph
         self.nodes  = {n["id"]: n for n in graph["nodes"]}
         self.edges  = graph["edges"]
 
-        # 연결 인덱스 구축
-        self.connected: set[str] = set()
-        self.in_edges:  dict[str, list] = defaultdict(list)
-        self.out_edges: dict[str, list] = defaultdict(list)
+    # 연결 인덱스 — 처음 필요할 때 엣지 1회 순회로 방향별·관계별 인덱스와 연결 노드 집합을 함께 채운다
+    # (노드만 보는 명령 — clusters, emergence 등 — 은 엣지 순회 비용을 치르지 않는다)
+    # 반환은 일반 dict·frozenset — defaultdict 를 내주면 없는 키 조회가 키를 끼워 넣어
+    # 연결 노드·고립 수·건강 점수가 조회 순서에 따라 달라진다
+    @cached_property
+    def _edge_index(self) -> tuple[dict, dict, dict, dict, frozenset]:
+        in_edges:  dict[str, list] = defaultdict(list)
+        out_edges: dict[str, list] = defaultdict(list)
+        by_rel_from: dict[str, dict[str, list]] = defaultdict(lambda: defaultdict(list))
+        by_rel_to:   dict[str, dict[str, list]] = defaultdict(lambda: defaultdict(list))
         for e in self.edges:
-            self.connected.add(e["from"])
-            self.connected.add(e["to"])
-            self.out_edges[e["from"]].append(e)
-            self.in_edges[e["to"]].append(e)
+            src, tgt = e["from"], e["to"]
+            rel = e.get("relation")
+            out_edges[src].append(e)
+            in_edges[tgt].append(e)
+            by_rel_from[rel][src].append(e)
+            by_rel_to[rel][tgt].append(e)
+        # 연결된 노드 = 출발/도착 인덱스 키의 합집합 (루프 안 set.add 2회 대신 C 레벨 합집합 1회)
+        connected = frozenset(out_edges.keys() | in_edges.keys())
+        return (
+            dict(in_edges),
+            dict(out_edges),
+            {rel: dict(idx) for rel, idx in by_rel_from.items()},
+            {rel: dict(idx) for rel, idx in by_rel_to.items()},
+            connected,
+        )
+
+    @cached_property
+    def in_edges(self) -> dict[str, list]:
+        return self._edge_index[0]
+
+    @cached_property
+    def out_edges(self) -> dict[str, list]:
+        return self._edge_index[1]
+
+    @cached_property
+    def edges_by_rel_from(self) -> dict[str, dict[str, list]]:
+        return self._edge_index[2]
+
+    @cached_property
+    def edges_by_rel_to(self) -> dict[str, dict[str, list]]:
+        return self._edge_index[3]
+
+    @cached_property
+    def connected(self) -> frozenset[str]:
+        return self._edge_index[4]
+
+    # answers/explores/investigates 엣지의 양 끝 노드 — 질문 응답 여부를 O(1)로 판정
+    @cached_property
+    def answered_question_ids(self) -> set[str]:
+        answered: set[str] = set()
+        for rel in _ANSWER_RELS:
+            answered.update(self.edges_by_rel_from.get(rel, ()))
+            answered.update(self.edges_by_rel_to.get(rel, ()))
+        return answered
 
     # 고립 노드 (엣지 없음)
     def orphan_nodes(self) -> list[dict]:
+        return self._orphans
+
+    @cached_property
+    def _orphans(self) -> list[dict]:
         return [n for n in self.nodes.values() if n["id"] not in self.connected]
 
     # 미답 질문 노드
     def unanswered_questions(self) -> list[dict]:
-        answered = {e["to"] for e in self.edges if self.nodes.get(e["from"], {}).get("type") != "question"}
+        return self._unanswered
+
+    @cached_property
+    def _unanswered(self) -> list[dict]:
         return [
-            n for n in self.nodes.values()
-            if n.get("type") == "question"
-            and not any(e["from"] == n["id"] or e["to"] == n["id"]
-                        for e in self.edges
-                        if e.get("relation") in ("answers", "explores", "investigates"))
+            n for n in self._node_scan[1].get("question", ())
+            if n["id"] not in self.answered_question_ids
         ]
 
+    # 노드 1회 순회로 출처 분포·타입별 노드 묶음·태그 군집·미래 태그 여부를 함께 수집
+    # 타입별 묶음은 열(column) 인덱스 역할 — 타입 분포와 질문 필터가 전체 노드를 다시 돌지 않는다
+    @cached_property
+    def _node_scan(self) -> tuple[Counter, dict[str, list[dict]], dict[str, list[str]], bool]:
+        src_dist:  Counter = Counter()
+        by_type:   dict[str, list[dict]] = defaultdict(list)
+        clusters:  dict[str, list[str]] = defaultdict(list)
+        has_future = False
+        for n in self.nodes.values():
+            src_dist[n.get("source", "unknown")] += 1
+            by_type[n.get("type", "unknown")].append(n)
+            tags = n.get("tags", [])
+            if not has_future and _FUTURE_TAGS.intersection(tags):
+                has_future = True
+            for tag in tags:
+                clusters[tag].append(n["id"])
+        return src_dist, by_type, clusters, has_future
+
     # 출처별 분포
     def source_distribution(self) -> dict[str, int]:
-        dist: dict[str, int] = defaultdict(int)
-        for n in self.nodes.values():
-            dist[n.get("source", "unknown")] += 1
-        return dict(dist)
+        return self._source_dist
+
+    @cached_property
+    def _source_dist(self) -> dict[str, int]:
+        # Counter 는 dict 하위형 — 호출부는 .get/.items 만 쓰므로 복사 없이 그대로 반환
+        return self._node_scan[0]
 
     # 타입별 분포
     def type_distribution(self) -> dict[str, int]:
-        dist: dict[str, int] = defaultdict(int)
-        for n in self.nodes.values():
-            dist[n.get("type", "unknown")] += 1
-        return dict(dist)
+        return self._type_dist
+
+    @cached_property
+    def _type_dist(self) -> dict[str, int]:
+        return {t: len(ns) for t, ns in self._node_scan[1].items()}
 
     # 태그 군집
     def tag_clusters(self) -> dict[str, list[str]]:
-        clusters: dict[str, list[str]] = defaultdict(list)
-        for n in self.nodes.values():
-            for tag in n.get("tags", []):
-                clusters[tag].append(n["id"])
+        return self._tag_clusters
+
+    @cached_property
+    def _tag_clusters(self) -> dict[str, list[str]]:
         # 2개 이상 노드가 있는 군집만
-        return {tag: ids for tag, ids in clusters.items() if len(ids) >= 2}
+        return {tag: ids for tag, ids in self._node_scan[2].items() if len(ids) >= 2}
+
+    # 미래 지향 태그(future/prediction/vision/roadmap)를 가진 노드 존재 여부
+    @cached_property
+    def has_future_nodes(self) -> bool:
+        return self._node_scan[3]
+
+    # 노드별 연결 수 (엣지 등장 순서 = 동률 노드의 정렬 순서)
+    @cached_property
+    def _degree(self) -> Counter:
+        # from/to 를 엣지 순서대로 이어 세어야 동률 노드의 순서가 유지된다
+        return Counter(chain.from_iterable((e["from"], e["to"]) for e in self.edges))
 
     # 허브 노드 (연결 많은 노드)
     def hub_nodes(self, top_n: int = 3) -> list[tuple[str, int]]:
-        degree = defaultdict(int)
-        for e in self.edges:
-            degree[e["from"]] += 1
-            degree[e["to"]]   += 1
-        return sorted(degree.items(), key=lambda x: -x[1])[:top_n]
+        return self._degree.most_common(top_n)
 
     # 건강 점수 (0–100)
     def health_score(self) -> int:
+        return self._health
+
+    @cached_property
+    def _health(self) -> int:
         n_nodes   = len(self.nodes)
         n_edges   = len(self.edges)
-        n_orphans = len(self.orphan_nodes())
-        n_unansw  = len(self.unanswered_questions())
+        n_orphans = len(self.nodes.keys() - self.connected)
+        n_unansw  = len(self._unanswered)
 
         if n_nodes == 0:
             return 0
@@ -164,7 +258,7 @@ PROPOSAL_TEMPLATES = [
         "type": "observation",
         "label_template": "고립 노드 발견 — 연결 필요: {ids}",
         "content_template": (
-            "그래프 분석 결과 {count}개 노드가 어떤 엣지와도 연결되지 않았다. "
+            "그래프 분석 결과 {orphan_count}개 노드가 어떤 엣지와도 연결되지 않았다. "
             "고립된 아이디어는 맥락을 잃는다. 이 노드들이 기존 개념과 "
             "어떻게 연결되는지 탐색해야 한다."
         ),
@@ -201,7 +295,7 @@ PROPOSAL_TEMPLATES = [
         "type": "insight",
         "label_template": "미답 질문 = 다음 사이클의 씨앗",
         "content_template": (
-            "그래프에 {count}개의 답 없는 질문이 있다. "
+            "그래프에 {unanswered_count}개의 답 없는 질문이 있다. "
             "이것들은 버그가 아니라 씨앗이다. 각 질문은 미래 사이클에서 "
             "탐색될 잠재적 방향이다. 의도적으로 질문을 열어두는 것이 "
             "창발의 원천이 된다."
@@ -212,6 +306,18 @@ PROPOSAL_TEMPLATES = [
 ]
 
 
+class _LazyCtx(dict):
+    """format_map 용 지연 컨텍스트 — 템플릿이 실제로 참조한 키만 계산 후 캐시"""
+
+    def __init__(self, **factories):
+        super().__init__()
+        self._factories = factories
+
+    def __missing__(self, key):
+        value = self[key] = self._factories[key]()
+        return value
+
+
 def generate_proposals(analyzer: GraphAnalyzer) -> list[dict]:
     proposals = []
     orphans  = analyzer.orphan_nodes()
@@ -220,10 +326,13 @@ def generate_proposals(analyzer: GraphAnalyzer) -> list[dict]:
     total    = len(analyzer.nodes)
 
     cokac_ratio = src_dist.get("cokac", 0) / max(total, 1)
-    future_tags = {"future", "prediction", "vision", "roadmap"}
-    has_future  = any(
-        future_tags & set(n.get("tags", []))
-        for n in analyzer.nodes.values()
+    has_future  = analyzer.has_future_nodes
+
+    ctx = _LazyCtx(
+        ids=lambda: ", ".join(n["id"] for n in orphans[:3]),
+        orphan_count=lambda: len(orphans),
+        unanswered_count=lambda: len(unansw),
+        ratio=lambda: cokac_ratio,
     )
 
     for tmpl in PROPOSAL_TEMPLATES:
@@ -237,15 +346,10 @@ def generate_proposals(analyzer: GraphAnalyzer) -> list[dict]:
         if cond == "has_unanswered" and not unansw:
             continue
 
-        ctx = {
-            "ids":   ", ".join(n["id"] for n in orphans[:3]),
-            "count": len(orphans) if cond == "has_orphans" else len(unansw),
-            "ratio": cokac_ratio,
-        }
         proposals.append({
             **tmpl,
-            "label":   tmpl["label_template"].format(**ctx),
-            "content": tmpl["content_template"].format(**ctx),
+            "label":   tmpl["label_template"].format_map(ctx),
+            "content": tmpl["content_template"].format_map(ctx),
         })
 
     return proposals
@@ -253,6 +357,14 @@ def generate_proposals(analyzer: GraphAnalyzer) -> list[dict]:
 
 # ─── 명령어: report ──────────────────────────────────────────────────────────
 
+# 막대 문자열 룩업 테이블 — 퍼센트/5 (0–20칸) 로 인덱싱
+_BARS_SRC    = tuple("▓" * i for i in range(21))
+_BARS_HEALTH = tuple(("█" * i, "░" * (20 - i)) for i in range(21))
+_REPORT_TYPE_ICONS = {
+    "decision": "⚖️ ", "observation": "👁 ", "insight": "💡",
+    "artifact": "📦", "question": "❓", "code": "💻",
+}
+
 def cmd_report(args) -> None:
     graph    = load_graph()
     analyzer = GraphAnalyzer(graph)
@@ -265,10 +377,11 @@ def cmd_report(args) -> None:
     hubs     = analyzer.hub_nodes()
     score    = analyzer.health_score()
 
-    bar_filled = "█" * (score // 5)
-    bar_empty  = "░" * (20 - score // 5)
+    bar_filled, bar_empty = _BARS_HEALTH[score // 5]
 
-    print(f"""
+    # 줄 단위 print() 대신 모아서 한 번에 출력
+    out: list[str] = []
+    out.append(f"""
 ╔══════════════════════════════════════════════════════╗
 ║        emergent 반성 보고서 — reflect.py v1          ║
 ║        생성: {datetime.now().strftime("%Y-%m-%d %H:%M")}  by cokac-bot      ║
@@ -285,41 +398,42 @@ def cmd_report(args) -> None:
 
     for src, cnt in sorted(src_dist.items(), key=lambda x: -x[1]):
         pct = cnt / max(len(analyzer.nodes), 1) * 100
-        bar = "▓" * int(pct / 5)
-        print(f"  {src:12s} {cnt:3d}개  {bar} {pct:.0f}%")
+        bar = _BARS_SRC[int(pct / 5)]
+        out.append(f"  {src:12s} {cnt:3d}개  {bar} {pct:.0f}%")
 
-    print("\n── 타입 분포 ──────────────────────────────────────────")
-    icons = {"decision":"⚖️ ","observation":"👁 ","insight":"💡","artifact":"📦","question":"❓","code":"💻"}
+    out.append("\n── 타입 분포 ──────────────────────────────────────────")
     for t, cnt in sorted(type_dist.items(), key=lambda x: -x[1]):
-        print(f"  {icons.get(t,'  ')}{t:14s} {cnt}개")
+        out.append(f"  {_REPORT_TYPE_ICONS.get(t,'  ')}{t:14s} {cnt}개")
 
     if hubs:
-        print("\n── 허브 노드 (연결 많은 것) ───────────────────────────")
+        out.append("\n── 허브 노드 (연결 많은 것) ───────────────────────────")
         for node_id, deg in hubs:
             n = analyzer.nodes[node_id]
-            print(f"  [{node_id}] {n['label'][:40]}  ({deg}개 연결)")
+            out.append(f"  [{node_id}] {n['label'][:40]}  ({deg}개 연결)")
 
     if clusters:
-        print("\n── 태그 군집 (2개 이상) ────────────────────────────────")
+        out.append("\n── 태그 군집 (2개 이상) ────────────────────────────────")
         for tag, ids in sorted(clusters.items(), key=lambda x: -len(x[1]))[:8]:
-            print(f"  #{tag:20s} {' '.join(ids)}")
+            out.append(f"  #{tag:20s} {' '.join(ids)}")
 
     if orphans:
-        print(f"\n── ⚠️  고립 노드 ({len(orphans)}개) ─────────────────────────────")
+        out.append(f"\n── ⚠️  고립 노드 ({len(orphans)}개) ─────────────────────────────")
         for n in orphans:
-            print(f"  [{n['id']}] {n.get('label', n['id'])}")
+            out.append(f"  [{n['id']}] {n.get('label', n['id'])}")
 
     if unansw:
-        print(f"\n── ❓ 미답 질문 ({len(unansw)}개) ─────────────────────────────")
+        out.append(f"\n── ❓ 미답 질문 ({len(unansw)}개) ─────────────────────────────")
         for n in unansw:
-            print(f"  [{n['id']}] {n.get('label', n['id'])}")
+            out.append(f"  [{n['id']}] {n.get('label', n['id'])}")
 
     proposals = generate_proposals(analyzer)
     if proposals:
-        print(f"\n── 💡 자동 생성 인사이트 후보 ({len(proposals)}개) ──────────────")
+        out.append(f"\n── 💡 자동 생성 인사이트 후보 ({len(proposals)}개) ──────────────")
         for i, p in enumerate(proposals, 1):
-            print(f"  {i}. [{p['type']}] {p['label']}")
-        print("\n  → `python reflect.py auto-add` 로 자동 추가 가능")
+            out.append(f"  {i}. [{p['type']}] {p['label']}")
+        out.append("\n  → `python reflect.py auto-add` 로 자동 추가 가능")
+
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 # ─── 명령어: orphans ─────────────────────────────────────────────────────────
@@ -332,10 +446,11 @@ def cmd_orphans(args) -> None:
         print("✅ 고립 노드 없음 — 모든 노드가 연결되어 있습니다")
         return
 
-    print(f"⚠️  고립 노드 {len(orphans)}개 발견:")
+    out = [f"⚠️  고립 노드 {len(orphans)}개 발견:"]
     for n in orphans:
-        print(f"  [{n['id']}] ({n['type']}) {n['label']}")
-        print(f"           tags: {', '.join(n.get('tags', []))}")
+        out.append(f"  [{n['id']}] ({n['type']}) {n['label']}")
+        out.append(f"           tags: {', '.join(n.get('tags', []))}")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 # ─── 명령어: gaps ────────────────────────────────────────────────────────────
@@ -397,35 +512,38 @@ def cmd_propose(args) -> None:
         print("✅ 현재 추가 제안 없음 — 그래프가 균형 잡혀 있습니다")
         return
 
-    print(f"💡 자동 생성 인사이트 후보 {len(proposals)}개:\n")
+    out = [f"💡 자동 생성 인사이트 후보 {len(proposals)}개:\n"]
     for i, p in enumerate(proposals, 1):
-        print(f"{'─'*60}")
-        print(f"  {i}. [{p['type'].upper()}]")
-        print(f"     제목: {p['label']}")
-        print(f"     내용: {p['content'][:120]}...")
-        print(f"     태그: {', '.join(p['tags'])}")
+        out.append(f"{'─'*60}")
+        out.append(f"  {i}. [{p['type'].upper()}]")
+        out.append(f"     제목: {p['label']}")
+        out.append(f"     내용: {p['content'][:120]}...")
+        out.append(f"     태그: {', '.join(p['tags'])}")
 
-    print(f"\n{'─'*60}")
-    print("→ `python reflect.py auto-add` 로 위 모든 제안을 자동 추가합니다")
+    out.append(f"\n{'─'*60}")
+    out.append("→ `python reflect.py auto-add` 로 위 모든 제안을 자동 추가합니다")
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 # ─── 엣지 제안 엔진 ──────────────────────────────────────────────────────────
 
 import re as _re
 
+_TOKEN_RE = _re.compile(r'[가-힣]{2,}|[a-zA-Z]{3,}')
+_STOPWORDS = frozenset({
+    # 한국어 불용어
+    '그것', '이것', '것이', '있다', '없다', '하다', '된다', '들이', '에서',
+    '때문', '위해', '같은', '하는', '있는', '없는', '이다', '이고', '하고',
+    '한다', '된다', '이런', '이후', '이전', '함께', '모든', '가장', '여러',
+    # 영어 불용어
+    'the', 'and', 'for', 'that', 'this', 'with', 'from', 'are', 'was',
+    'not', 'but', 'can', 'will', 'has', 'have', 'its', 'our',
+})
+
+
 def _tokenize(text: str) -> set:
     """한국어/영어 텍스트에서 의미 있는 토큰 추출 (2글자 이상)"""
-    tokens = _re.findall(r'[가-힣]{2,}|[a-zA-Z]{3,}', text)
-    stopwords = {
-        # 한국어 불용어
-        '그것', '이것', '것이', '있다', '없다', '하다', '된다', '들이', '에서',
-        '때문', '위해', '같은', '하는', '있는', '없는', '이다', '이고', '하고',
-        '한다', '된다', '이런', '이후', '이전', '함께', '모든', '가장', '여러',
-        # 영어 불용어
-        'the', 'and', 'for', 'that', 'this', 'with', 'from', 'are', 'was',
-        'not', 'but', 'can', 'will', 'has', 'have', 'its', 'our',
-    }
-    return {t.lower() for t in tokens if t.lower() not in stopwords}
+    return {t for t in (tok.lower() for tok in _TOKEN_RE.findall(text)) if t not in _STOPWORDS}
 
 
 def _jaccard(set_a: set, set_b: set) -> float:
@@ -470,25 +588,47 @@ def _compute_similarity(a: dict, b: dict) -> float:
     출처 식별 태그(cokac, 록이 등)는 유사도 계산에서 제외:
       #cokac 태그가 cokac 노드끼리만 공유되어 같은 출처 편향을 유발하던 버그 수정.
     """
+    return _similarity_from_features(_node_features(a), _node_features(b))
+
+
+def _node_features(n: dict) -> tuple[set, set, set, str]:
+    """유사도 계산용 노드 특징 (태그, 레이블 토큰, 내용 토큰, 출처 그룹) — 노드당 1회 계산"""
     # 출처 식별 태그 제외 (D-033: #cokac/#록이 태그가 같은 출처 편향 유발)
-    tags_a = {t for t in a.get("tags", []) if t not in _SOURCE_IDENTITY_TAGS}
-    tags_b = {t for t in b.get("tags", []) if t not in _SOURCE_IDENTITY_TAGS}
+    tags = {t for t in n.get("tags", []) if t not in _SOURCE_IDENTITY_TAGS}
+    return (
+        tags,
+        _tokenize(n.get("label", "")),
+        _tokenize(n.get("content", "")),
+        _source_group(n.get("source", "")),
+    )
+
+
+def _similarity_from_features(fa: tuple, fb: tuple, threshold: float = 0.0) -> float:
+    """_node_features 로 미리 계산한 특징끼리의 유사도 — 가중치는 _compute_similarity 참조
+
+    threshold 가 주어지면, 레이블·내용 유사도를 최대(1.0)로 잡아도 threshold 에 못 미치는
+    쌍은 Jaccard 계산 없이 0.0 을 돌려준다 (threshold 이상인 쌍의 값은 그대로).
+    """
+    tags_a, label_a, content_a, group_a = fa
+    tags_b, label_b, content_b, group_b = fb
     t_sim = _tag_sim(tags_a, tags_b)
+    same_source = group_a != "other" and group_a == group_b
 
-    label_sim = _jaccard(_tokenize(a.get("label", "")), _tokenize(b.get("label", "")))
+    if threshold > 0:
+        # 아래와 같은 부동소수 연산으로 구한 상한 — 실제 값은 이보다 클 수 없다
+        upper = t_sim * 0.60 + 1.0 * 0.15 + 1.0 * 0.25
+        upper = upper * 0.25 if same_source else min(upper * 1.5, 1.0)
+        if upper < threshold:
+            return 0.0
 
-    content_sim = _jaccard(
-        _tokenize(a.get("content", "")),
-        _tokenize(b.get("content", "")),
-    )
+    label_sim = _jaccard(label_a, label_b)
+
+    content_sim = _jaccard(content_a, content_b)
 
     base_sim = t_sim * 0.60 + label_sim * 0.15 + content_sim * 0.25
 
     # D-033: 출처 경계 가중치
-    group_a = _source_group(a.get("source", ""))
-    group_b = _source_group(b.get("source", ""))
-
-    if group_a != "other" and group_a == group_b:
+    if same_source:
         # 같은 출처 — 창발 기여 없음, 강한 패널티
         return base_sim * 0.25
     else:
@@ -496,15 +636,22 @@ def _compute_similarity(a: dict, b: dict) -> float:
         return min(base_sim * 1.5, 1.0)
 
 
-def _explain_similarity(a: dict, b: dict) -> str:
-    """유사도의 가장 강한 근거를 한 문장으로"""
+def _explain_words(n: dict) -> set:
+    """_explain_similarity 가 비교하는 노드 단어 집합 (내용 + 레이블)"""
+    return _tokenize(n.get("content", "") + " " + n.get("label", ""))
+
+
+def _explain_similarity(a: dict, b: dict, all_a: set | None = None, all_b: set | None = None) -> str:
+    """유사도의 가장 강한 근거를 한 문장으로 (all_a/all_b: 미리 계산한 _explain_words)"""
     shared_tags = set(a.get("tags", [])) & set(b.get("tags", []))
     if shared_tags:
         tags_str = ", ".join(sorted(shared_tags)[:3])
         return f"공통 태그: #{tags_str}"
 
-    all_a = _tokenize(a.get("content", "") + " " + a.get("label", ""))
-    all_b = _tokenize(b.get("content", "") + " " + b.get("label", ""))
+    if all_a is None:
+        all_a = _explain_words(a)
+    if all_b is None:
+        all_b = _explain_words(b)
     shared_words = all_a & all_b
     if shared_words:
         # 긴 단어(더 구체적) 우선 최대 3개
@@ -516,6 +663,46 @@ def _explain_similarity(a: dict, b: dict) -> str:
 
 # ─── 명령어: suggest-edges ───────────────────────────────────────────────────
 
+def _suggest_candidates(features: list[tuple], threshold: float) -> list[tuple[int, int]]:
+    """유사도가 threshold 에 닿을 수 있는 노드 쌍 (i < j) 만 (i, j) 순서로 반환
+
+    역색인(태그 → 노드, 토큰 → 노드)으로 무언가를 공유하는 쌍만 후보로 만든다.
+    태그도 토큰도 공유하지 않는 쌍은 유사도가 정확히 0 이라 제외해도 결과가 같다.
+      - 태그 공유 없는 쌍의 상한: (0.15 + 0.25) × 1.5 = 0.60 → threshold > 0.60 이면 태그 버킷만
+      - 태그 공유 없는 같은 출처 쌍의 상한: 0.40 × 0.25 = 0.10 → threshold > 0.10 이면 토큰 버킷에서 제외
+    """
+    n_nodes = len(features)
+    if threshold <= 0:
+        return [(i, j) for i in range(n_nodes) for j in range(i + 1, n_nodes)]
+
+    tag_index: dict[str, list[int]] = defaultdict(list)
+    for k, (tags, _, _, _) in enumerate(features):
+        for tag in tags:
+            tag_index[tag].append(k)
+
+    candidates: set[tuple[int, int]] = set()
+    for ids in tag_index.values():
+        candidates.update(combinations(ids, 2))
+
+    # 태그 공유가 없을 때 도달 가능한 최대 유사도 (_compute_similarity 와 같은 부동소수 연산)
+    no_tag_cross_max = min((0.15 + 0.25) * 1.5, 1.0)
+    no_tag_same_max  = (0.15 + 0.25) * 0.25
+    if threshold <= no_tag_cross_max:
+        groups = [f[3] for f in features]
+        skip_same = threshold > no_tag_same_max
+        token_index: dict[str, list[int]] = defaultdict(list)
+        for k, (_, label_toks, content_toks, _) in enumerate(features):
+            for tok in label_toks | content_toks:
+                token_index[tok].append(k)
+        for ids in token_index.values():
+            for i, j in combinations(ids, 2):
+                if skip_same and groups[i] != "other" and groups[i] == groups[j]:
+                    continue
+                candidates.add((i, j))
+
+    return sorted(candidates)
+
+
 def cmd_suggest_edges(args) -> None:
     """노드 쌍 유사도 기반 잠재 엣지 제안 — D-033 출처 경계 가중치 적용, 자동 추가 없음"""
     graph    = load_graph()
@@ -523,34 +710,42 @@ def cmd_suggest_edges(args) -> None:
     threshold = args.threshold
     cross_only = getattr(args, "cross_source_only", False)
 
-    # 이미 존재하는 엣지 쌍 (중복 방지, 방향 무시)
-    existing: set = set()
-    for e in graph["edges"]:
-        existing.add((e["from"], e["to"]))
-        existing.add((e["to"],   e["from"]))
+    # 이미 존재하는 엣지 쌍 (중복 방지, 방향 무시) — (작은 id, 큰 id) 정규형으로 한 번만 저장
+    existing: set = {
+        (f, t) if f < t else (t, f)
+        for f, t in ((e["from"], e["to"]) for e in graph["edges"])
+    }
 
     node_map = {n["id"]: n for n in nodes}
     suggestions: list = []
 
-    for i in range(len(nodes)):
-        for j in range(i + 1, len(nodes)):
-            a = nodes[i]
-            b = nodes[j]
-            if (a["id"], b["id"]) in existing:
-                continue
+    # 토큰화·태그 필터링은 노드당 1회 — 쌍마다 반복하지 않는다
+    features = [_node_features(n) for n in nodes]
+    words: dict[int, set] = {}    # _explain_words 지연 캐시 (제안에 오른 노드만)
 
-            group_a = _source_group(a.get("source", ""))
-            group_b = _source_group(b.get("source", ""))
-            is_cross = (group_a != group_b) or (group_a == "other")
+    for i, j in _suggest_candidates(features, threshold):
+        a = nodes[i]
+        b = nodes[j]
+        a_id, b_id = a["id"], b["id"]
+        if ((a_id, b_id) if a_id < b_id else (b_id, a_id)) in existing:
+            continue
+
+        group_a = features[i][3]
+        group_b = features[j][3]
+        is_cross = (group_a != group_b) or (group_a == "other")
 
-            # --cross-source-only: 같은 출처 쌍 완전 제외
-            if cross_only and not is_cross:
-                continue
+        # --cross-source-only: 같은 출처 쌍 완전 제외
+        if cross_only and not is_cross:
+            continue
 
-            sim = _compute_similarity(a, b)
-            if sim >= threshold:
-                reason = _explain_similarity(a, b)
-                suggestions.append((a["id"], b["id"], sim, reason, is_cross))
+        sim = _similarity_from_features(features[i], features[j], threshold)
+        if sim >= threshold:
+            if i not in words:
+                words[i] = _explain_words(a)
+            if j not in words:
+                words[j] = _explain_words(b)
+            reason = _explain_similarity(a, b, words[i], words[j])
+            suggestions.append((a["id"], b["id"], sim, reason, is_cross))
 
     suggestions.sort(key=lambda x: -x[2])
 
@@ -596,25 +791,28 @@ def cmd_auto_add(args) -> None:
         print("✅ 추가할 노드 없음")
         return
 
-    added = []
-    for p in proposals:
-        node_id  = graph["meta"]["next_node_id"]
-        prefix, num_str = node_id.rsplit("-", 1)
-        next_id  = f"{prefix}-{int(num_str) + 1:03d}"
-        graph["meta"]["next_node_id"] = next_id
+    # ID는 한 번만 파싱해 일괄 발급 — 첫 ID는 meta 값 그대로, 이후는 번호 +1
+    first_id = graph["meta"]["next_node_id"]
+    prefix, num_str = first_id.rsplit("-", 1)
+    base  = int(num_str)
+    today = datetime.now().strftime("%Y-%m-%d")
 
-        node = {
-            "id":      node_id,
+    added = [
+        {
+            "id":      first_id if i == 0 else f"{prefix}-{base + i:03d}",
             "type":    p["type"],
             "label":   p["label"],
             "content": p["content"],
             "source":  p["source"],
-            "date":    datetime.now().strftime("%Y-%m-%d"),
+            "date":    today,
             "tags":    p["tags"],
         }
-        graph["nodes"].append(node)
-        added.append(node)
-        print(f"  ✅ 추가: [{node_id}] {node['label'][:50]}")
+        for i, p in enumerate(proposals)
+    ]
+    graph["nodes"].extend(added)
+    graph["meta"]["next_node_id"] = f"{prefix}-{base + len(added):03d}"
+    for node in added:
+        print(f"  ✅ 추가: [{node['id']}] {node['label'][:50]}")
 
     save_graph(graph)
 
@@ -722,13 +920,7 @@ def cmd_graph_viz(args) -> None:
     node_map = analyzer.nodes
 
     # ── 허브 계산 ──────────────────────────────────────────
-    degree: dict[str, int] = defaultdict(int)
-    for e in analyzer.edges:
-        degree[e["from"]] += 1
-        degree[e["to"]]   += 1
-
-    hubs = sorted(degree.items(), key=lambda x: -x[1])
-    top_hubs = hubs[:5]          # 상위 5개 허브
+    top_hubs = analyzer.hub_nodes(5)          # 상위 5개 허브 (분석기의 캐시된 연결 수 재사용)
 
     total_nodes = len(node_map)
     total_edges = len(analyzer.edges)
@@ -889,10 +1081,8 @@ def cmd_emergence(args) -> None:
     # ── 1. 출처별 분류 ────────────────────────────────────────
     roki_nodes  = [n for n in graph["nodes"] if n.get("source", "") in _ROKI_SOURCES]
     cokac_nodes = [n for n in graph["nodes"] if n.get("source", "") in _COKAC_SOURCES]
-    other_nodes = [
-        n for n in graph["nodes"]
-        if n.get("source", "") not in (_ROKI_SOURCES | _COKAC_SOURCES)
-    ]
+    known_sources = _ROKI_SOURCES | _COKAC_SOURCES
+    other_count = sum(1 for n in graph["nodes"] if n.get("source", "") not in known_sources)
 
     # ── 2. 태그 집합 계산 ──────────────────────────────────────
     roki_tag_pool  = set()
@@ -1007,7 +1197,7 @@ def cmd_emergence(args) -> None:
         print()
 
     print(f"   그래프: {len(graph['nodes'])}노드 / {len(graph['edges'])}엣지")
-    print(f"   록이 노드 {len(roki_nodes)}개 | cokac 노드 {len(cokac_nodes)}개 | 기타 {len(other_nodes)}개")
+    print(f"   록이 노드 {len(roki_nodes)}개 | cokac 노드 {len(cokac_nodes)}개 | 기타 {other_count}개")
     print()
     print("   ─ 측정 시도 자체가 창발이다. ─ 록이, 사이클 8 ─")
     print()
@@ -1335,18 +1525,17 @@ def cmd_echo_check(args) -> None:
     disruptive_count = 0
     neutral_count   = 0
 
-    rel_tally: dict[str, int] = defaultdict(int)
-    for e in edges:
-        rel = e.get("relation", "")
-        rel_tally[rel] += 1
+    # 관계별 개수는 Counter(C 경로)로 세고, 분류는 서로 다른 관계 종류만큼만 돈다
+    rel_tally = Counter(e.get("relation", "") for e in edges)
+    for rel, cnt in rel_tally.items():
         if rel in _ECHO_STRONG:
-            strong_count += 1
+            strong_count += cnt
         elif rel in _ECHO_MODERATE:
-            moderate_count += 1
+            moderate_count += cnt
         elif rel in _DISRUPTIVE:
-            disruptive_count += 1
+            disruptive_count += cnt
         else:
-            neutral_count += 1
+            neutral_count += cnt
 
     echo_weighted   = strong_count * 1.0 + moderate_count * 0.5
     echo_ratio      = echo_weighted / total
@@ -1495,7 +1684,7 @@ def cmd_timeline(args) -> None:
             line = line.strip()
             if line:
                 try:
-                    records.append(json.loads(line))
+                    records.append(json_loads(line))
                 except json.JSONDecodeError:
                     pass
 
@@ -0,0 +1,145 @@
+"""공용 픽스처 — 무작위 KG 생성기와 가지치기 없는 기준 구현(brute-force oracle)."""
+
+import random
+from collections import defaultdict
+
+import pytest
+
+from src.pair_designer_v4 import (
+    DCI_FEEDING_RELATIONS,
+    MIN_SPAN,
+    infer_relation,
+    node_num,
+    score_pair_v4,
+)
+from src.path_alternation_detector import normalize_source
+from src.reflect import _compute_similarity, _source_group
+
+
+SOURCES = ["록이", "상록", "cokac", "cokac-bot", "gpt", ""]
+TYPES = ["insight", "observation", "question"]
+TAGS = ["memory", "future", "prediction", "api", "loop", "echo", "gap", "cokac", "록이"]
+WORDS = ["창발", "경계", "출처", "교대", "memory", "graph", "edge", "signal", "loop",
+         "delay", "seed", "bridge"]
+# 번호 없는 n- id (node_num → 0), n- 아닌 id
+ODD_IDS = ("n-execloop-075", "n-execloop-076", "x-999")
+
+
+def random_kg(n_nodes=40, n_edges=60, seed=0, *, sources=SOURCES, types=TYPES,
+              relations=("relates_to",), id_range=None, domains=None,
+              odd_ids=False, twins=False, duplicate=False, dangling=False):
+    """n-NNN 노드와 임의 엣지로 된 KG — 같은 seed 면 같은 그래프.
+
+    id_range:  지정 시 노드 번호를 1..id_range 에서 표본 추출 (번호 간격이 고르지 않은 KG)
+    domains:   지정 시 노드 2/3 에 ontology.domain 부여
+    odd_ids:   ODD_IDS 노드 추가 (엣지 없음)
+    twins:     다섯 노드마다 한 쌍의 레이블·내용을 같게 (유사도 1.0)
+    duplicate: 첫 엣지를 한 번 더 추가
+    dangling:  노드 목록에 없는 끝점으로 가는 엣지 추가
+    """
+    rng = random.Random(seed)
+    nums = (rng.sample(range(1, id_range + 1), n_nodes) if id_range
+            else range(1, n_nodes + 1))
+    nodes = [
+        {
+            "id": f"n-{k:03d}",
+            "type": rng.choice(types),
+            "source": rng.choice(sources),
+            "label": " ".join(rng.sample(WORDS, rng.randint(0, 3))),
+            "content": " ".join(rng.sample(WORDS, rng.randint(0, 4))),
+            "tags": rng.sample(TAGS, rng.randint(0, 3)),
+        }
+        for k in nums
+    ]
+    ids = [n["id"] for n in nodes]
+    edges = [
+        {"from": u, "to": v, "relation": rng.choice(relations)}
+        for u, v in (rng.sample(ids, 2) for _ in range(n_edges))
+    ]
+    if domains:
+        for i, node in enumerate(nodes):
+            if i % 3:
+                node["ontology"] = {"domain": domains[i % len(domains)]}
+    if twins:
+        for a, b in zip(nodes[::5], nodes[1::5]):
+            b["label"], b["content"] = a["label"], a["content"]
+    if odd_ids:
+        nodes += [{"id": nid, "type": types[0], "source": "cokac"} for nid in ODD_IDS]
+    if duplicate and edges:
+        edges.append(dict(edges[0]))
+    if dangling:
+        edges.append({"from": ids[0], "to": "n-missing", "relation": relations[0]})
+    return {"nodes": nodes, "edges": edges, "meta": {}}
+
+
+@pytest.fixture
+def make_kg():
+    return random_kg
+
+
+# ─── 기준 구현 ──────────────────────────────────────────────────────────────
+
+def brute_force_rank(kg):
+    """pair_designer_v4: 모든 (i, j) 쌍을 score_pair_v4 로 채점."""
+    nodes = [n for n in kg["nodes"] if n["id"].startswith("n-")]
+    max_nid = max(node_num(n["id"]) for n in nodes)
+    existing = {frozenset((e["from"], e["to"])) for e in kg["edges"]}
+    scored = []
+    for i in range(len(nodes)):
+        for j in range(i + 1, len(nodes)):
+            a, b = nodes[i], nodes[j]
+            if frozenset((a["id"], b["id"])) in existing:
+                continue
+            if abs(node_num(a["id"]) - node_num(b["id"])) < MIN_SPAN:
+                continue
+            rel, _ = infer_relation(a.get("type", ""), b.get("type", ""))
+            if rel in DCI_FEEDING_RELATIONS:
+                continue
+            scored.append((score_pair_v4(a, b, max_nid), i, j))
+    scored.sort(key=lambda t: (-t[0]["combined"], t[1], t[2]))
+    return [s for s, _, _ in scored]
+
+
+def exhaustive_paths(kg, max_depth):
+    """path_alternation_detector: 모든 시작 노드에서 길이 2..max_depth 단순 경로를 전부 나열."""
+    src = defaultdict(lambda: "?")
+    src.update((n["id"], normalize_source(n.get("source", "?"))) for n in kg["nodes"])
+    adj = defaultdict(list)
+    for e in kg["edges"]:
+        adj[e["from"]].append(e["to"])
+        adj[e["to"]].append(e["from"])
+
+    found = []
+
+    def walk(path, trans):
+        if len(path) >= 2:
+            found.append((tuple(path), trans / (len(path) - 1)))
+        if len(path) == max_depth:
+            return
+        for nxt in adj[path[-1]]:
+            if nxt not in path:
+                walk(path + [nxt], trans + (src[nxt] != src[path[-1]]))
+
+    for n in kg["nodes"]:
+        walk([n["id"]], 0)
+    return found
+
+
+def brute_force_suggestions(graph, threshold, cross_only=False):
+    """reflect suggest-edges: 모든 쌍을 _compute_similarity 로 채점."""
+    nodes = graph["nodes"]
+    existing = {frozenset((e["from"], e["to"])) for e in graph["edges"]}
+    found = []
+    for i in range(len(nodes)):
+        for j in range(i + 1, len(nodes)):
+            a, b = nodes[i], nodes[j]
+            if frozenset((a["id"], b["id"])) in existing:
+                continue
+            ga, gb = _source_group(a["source"]), _source_group(b["source"])
+            if cross_only and not (ga != gb or ga == "other"):
+                continue
+            sim = _compute_similarity(a, b)
+            if sim >= threshold:
+                found.append((a["id"], b["id"], sim))
+    found.sort(key=lambda x: -x[2])
+    return found
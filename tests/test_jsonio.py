@@ -0,0 +1,63 @@
+"""jsonio — orjson 빠른 경로·파일 로더 결과를 stdlib json 과 비교."""
+
+import json
+
+import pytest
+
+import src.jsonio as jsonio
+from src.jsonio import JSON_ERRORS, json_dumps, json_load_file, json_loads
+
+
+CASES = [
+    {"nodes": [{"id": "n-001", "label": "창발", "score": 0.25, "tags": []}], "meta": None},
+    {"score": float("nan")},
+    {"score": [float("inf"), float("-inf")]},
+    {"id": 2 ** 70},
+    {"big": 1e16, "small": 1e-05},
+    {1: "non-str key"},
+    [],
+]
+
+
+class TestJsonDumps:
+    @pytest.mark.parametrize("newline", [False, True])
+    @pytest.mark.parametrize("obj", CASES)
+    def test_matches_stdlib(self, obj, newline):
+        expected = json.dumps(obj, ensure_ascii=False, indent=2) + ("\n" if newline else "")
+        assert json_dumps(obj, newline=newline) == expected.encode("utf-8")
+
+    @pytest.mark.parametrize("obj", CASES[:5])
+    def test_round_trip(self, obj):
+        # NaN != NaN 이라 값 비교 대신 다시 직렬화해 비교
+        assert json.dumps(json_loads(json_dumps(obj))) == json.dumps(obj)
+
+
+class TestJsonLoadFile:
+    @pytest.fixture(params=["orjson", "json"])
+    def backend(self, request, monkeypatch):
+        # 설치된 선택 백엔드와 무관하게 표준 json 경로도 시험
+        if request.param == "json":
+            monkeypatch.setattr(jsonio, "orjson", None)
+            monkeypatch.setattr(jsonio, "ijson", None)
+        elif jsonio.orjson is None:
+            pytest.skip("orjson 없음")
+        return request.param
+
+    @pytest.mark.parametrize("obj", CASES[:6] + [{"nodes": [], "edges": [], "meta": {}}])
+    def test_matches_stdlib(self, tmp_path, backend, obj):
+        text = json.dumps(obj, ensure_ascii=False, indent=2)
+        path = tmp_path / "kg.json"
+        path.write_text(text, encoding="utf-8")
+        # NaN != NaN 이라 값 비교 대신 다시 직렬화해 비교
+        assert json.dumps(json_load_file(path)) == json.dumps(json.loads(text))
+
+    @pytest.mark.parametrize("content", [b"", b"{\"nodes\": [", b"not json"])
+    def test_broken_file_raises_json_error(self, tmp_path, backend, content):
+        path = tmp_path / "kg.json"
+        path.write_bytes(content)
+        with pytest.raises(JSON_ERRORS):
+            json_load_file(path)
+
+    def test_missing_file_raises_oserror(self, tmp_path, backend):
+        with pytest.raises(OSError):
+            json_load_file(tmp_path / "missing.json")
@@ -0,0 +1,90 @@
+"""metrics — 증분 지표를 전체 재계산과 비교."""
+
+import copy
+import random
+
+import pytest
+
+from src.metrics import (
+    compute_all_metrics,
+    compute_all_metrics_incremental,
+    metrics_state,
+)
+
+
+SOURCES = ["cokac-bot", "cokac", "록이", "상록", "gpt-critic", "gemini-analyst"]
+DOMAINS = ["physics", "biology", "philosophy"]
+RELATIONS = ("answers", "relates_to", "extends")
+
+
+METRICS_KG = dict(n_nodes=30, n_edges=40, sources=SOURCES, types=["question", "observation"],
+                  relations=RELATIONS, domains=DOMAINS, odd_ids=True)
+
+
+def random_edges(kg, count, rng, sources=None):
+    ids = [n["id"] for n in kg["nodes"]
+           if sources is None or n.get("source") in sources]
+    return [
+        {"from": u, "to": v, "relation": rng.choice(RELATIONS)}
+        for u, v in (rng.sample(ids, 2) for _ in range(count))
+    ]
+
+
+def cross_source_edges(kg):
+    src = {n["id"]: n["source"] for n in kg["nodes"]}
+    ids = sorted(src)
+    return [
+        {"from": u, "to": v, "relation": "answers"}
+        for u, v in zip(ids, ids[1:]) if src[u] != src[v]
+    ]
+
+
+def merged(kg, edges):
+    return {"nodes": kg["nodes"], "edges": kg["edges"] + edges}
+
+
+class TestMetricsIncremental:
+    def test_empty_batch(self, make_kg):
+        kg = make_kg(**METRICS_KG)
+        assert compute_all_metrics_incremental(metrics_state(kg), []) == compute_all_metrics(kg)
+
+    def test_empty_kg_edges(self, make_kg):
+        kg = make_kg(**dict(METRICS_KG, n_edges=0))
+        state = metrics_state(kg)
+        assert compute_all_metrics_incremental(state, []) == compute_all_metrics(kg)
+        batch = random_edges(kg, 1, random.Random(1))
+        assert compute_all_metrics_incremental(state, batch) == compute_all_metrics(merged(kg, batch))
+
+    def test_cross_source_batch(self, make_kg):
+        kg = make_kg(seed=2, **METRICS_KG)
+        batch = cross_source_edges(kg)
+        assert batch
+        result = compute_all_metrics_incremental(metrics_state(kg), batch)
+        assert result == compute_all_metrics(merged(kg, batch))
+
+    def test_same_source_batch(self, make_kg):
+        kg = make_kg(seed=3, **METRICS_KG)
+        batch = random_edges(kg, 10, random.Random(3), sources={"cokac-bot", "cokac"})
+        result = compute_all_metrics_incremental(metrics_state(kg), batch)
+        assert result == compute_all_metrics(merged(kg, batch))
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_successive_batches(self, make_kg, seed):
+        rng = random.Random(seed)
+        kg = make_kg(seed=seed, **METRICS_KG)
+        batches = [random_edges(kg, rng.randint(1, 15), rng) for _ in range(4)]
+        batches.insert(2, [])
+        batches.append(cross_source_edges(kg))
+        for batch in batches:
+            state = metrics_state(kg)
+            result = compute_all_metrics_incremental(state, batch)
+            kg = merged(kg, batch)
+            assert result == compute_all_metrics(kg)
+
+    def test_state_not_mutated(self, make_kg):
+        kg = make_kg(seed=4, **METRICS_KG)
+        state = metrics_state(kg)
+        before = copy.deepcopy(state)
+        compute_all_metrics_incremental(state, random_edges(kg, 20, random.Random(4)))
+        assert state == before
+        assert compute_all_metrics_incremental(state, []) == compute_all_metrics(kg)
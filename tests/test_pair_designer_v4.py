@@ -0,0 +1,158 @@
+"""pair_designer_v4 — 후보 순위를 모든 쌍 채점(brute_force_rank)과 비교."""
+
+import pickle
+import sys
+
+import pytest
+
+import src.pair_designer_v4 as v4
+from src.jsonio import json_dumps, json_loads
+from src.pair_designer_v4 import MIN_SPAN, TYPE_COMPAT, rank_candidates
+from tests.conftest import brute_force_rank
+
+
+TYPES = sorted({t for pair in TYPE_COMPAT for t in pair}) + ["unknown"]
+
+
+PAIR_KG = dict(n_nodes=80, n_edges=120, types=TYPES, id_range=199, odd_ids=True, dangling=True)
+
+
+class TestRankCandidates:
+    @pytest.mark.parametrize("seed", range(4))
+    def test_matches_brute_force(self, make_kg, seed):
+        kg = make_kg(seed=seed, **PAIR_KG)
+        expected = brute_force_rank(kg)
+        assert expected
+        assert rank_candidates(kg) == expected
+
+    def test_pool_stats(self, make_kg):
+        kg = make_kg(seed=7, **PAIR_KG)
+        stats = {}
+        ranked = rank_candidates(kg, stats=stats)
+        assert stats["cross"] + stats["same"] == len(ranked)
+        assert stats["cross"] == sum(1 for c in ranked if c["cross_source"])
+
+    def test_all_spans_below_min(self):
+        nodes = [{"id": f"n-{k:03d}", "type": "insight", "source": "cokac"}
+                 for k in range(1, MIN_SPAN)]
+        assert rank_candidates({"nodes": nodes, "edges": []}) == []
+
+
+class TestRankCandidatesTopN:
+    @pytest.mark.parametrize("seed", range(3))
+    def test_top_n_is_prefix(self, make_kg, seed):
+        kg = make_kg(seed=seed, **PAIR_KG)
+        full = rank_candidates(kg)
+        for k in (0, 1, 2, 5, 17, 100, len(full) - 1, len(full), len(full) + 50):
+            assert rank_candidates(kg, top_n=k) == full[:k]
+
+    def test_ties_at_cutoff(self):
+        # 같은 출처·같은 span 간격 → combined 동점이 많은 KG
+        nodes = [{"id": f"n-{k:03d}", "type": "insight", "source": "cokac"}
+                 for k in range(1, 61)]
+        kg = {"nodes": nodes, "edges": []}
+        full = rank_candidates(kg)
+        combined = [c["combined"] for c in full]
+        # 동점 구간 한가운데에서 자르는 k — 경계 밖 동점 후보와의 순서가 그대로여야 함
+        tie_cuts = [k for k in range(1, len(full)) if combined[k - 1] == combined[k]]
+        assert len(tie_cuts) > 10
+        for k in tie_cuts[::5]:
+            assert rank_candidates(kg, top_n=k) == full[:k]
+
+    def test_stats_independent_of_top_n(self, make_kg):
+        kg = make_kg(seed=5, **PAIR_KG)
+        full_stats, top_stats = {}, {}
+        rank_candidates(kg, stats=full_stats)
+        rank_candidates(kg, top_n=3, stats=top_stats)
+        assert top_stats == full_stats
+
+
+class TestCandidateCache:
+    @pytest.fixture(autouse=True)
+    def isolated(self, monkeypatch, tmp_path, make_kg):
+        # KG·캐시·키 소스를 모두 tmp_path 로 — 저장소 data/ 와 ~/.cache 를 건드리지 않도록
+        self.kg_file = tmp_path / "kg.json"
+        self.kg_file.write_bytes(json_dumps(make_kg(seed=3, **PAIR_KG)))
+        self.source = tmp_path / "scoring.py"
+        self.source.write_text("W = 1\n")
+        self.cache_dir = tmp_path / "cache"
+        monkeypatch.setattr(v4, "KG_FILE", self.kg_file)
+        monkeypatch.setattr(v4, "CACHE_DIR", self.cache_dir)
+        monkeypatch.setattr(v4, "CAND_CACHE", self.cache_dir / "cand.pkl")
+        monkeypatch.setattr(v4, "CACHE_SOURCES", (self.source,))
+        self.rank_calls = 0
+        rank = v4.rank_candidates
+
+        def spy(*args, **kwargs):
+            self.rank_calls += 1
+            return rank(*args, **kwargs)
+
+        monkeypatch.setattr(v4, "rank_candidates", spy)
+        self.monkeypatch = monkeypatch
+
+    def run(self, capsys, *args):
+        self.monkeypatch.setattr(sys, "argv", ["pair_designer_v4.py", "--json", *args])
+        v4.main()
+        out = capsys.readouterr().out
+        return json_loads(out[out.index("{"):])
+
+    def key(self):
+        return v4._cache_key(self.kg_file.read_bytes())
+
+    def test_read_only_run_writes_no_cache(self, capsys):
+        self.run(capsys)
+        self.run(capsys)
+        assert self.rank_calls == 2
+        assert not self.cache_dir.exists()
+
+    def test_hit_matches_fresh_ranking(self, capsys):
+        fresh = self.run(capsys, "--cache")
+        cached = self.run(capsys, "--cache")
+        assert self.rank_calls == 1
+        assert cached == fresh
+
+    def test_smaller_top_n_hits(self, capsys):
+        full = self.run(capsys, "--cache", "--top", "10")
+        top = self.run(capsys, "--cache", "--top", "4")
+        assert self.rank_calls == 1
+        assert top["candidates"] == full["candidates"][:4]
+
+    def test_larger_top_n_misses(self, capsys):
+        self.run(capsys, "--cache", "--top", "4")
+        self.run(capsys, "--cache", "--top", "10")
+        assert self.rank_calls == 2
+
+    def test_kg_change_misses(self, capsys):
+        self.run(capsys, "--cache")
+        before = self.key()
+        kg = json_loads(self.kg_file.read_bytes())
+        kg["edges"].pop()
+        self.kg_file.write_bytes(json_dumps(kg))
+        assert self.key() != before
+        assert v4.load_candidates(self.key(), 1) is None
+        self.run(capsys, "--cache")
+        assert self.rank_calls == 2
+
+    def test_source_change_misses(self, capsys):
+        self.run(capsys, "--cache")
+        before = self.key()
+        self.source.write_text("W = 2\n")
+        assert self.key() != before
+        self.run(capsys, "--cache")
+        assert self.rank_calls == 2
+
+    @pytest.mark.parametrize("payload", [
+        b"",                                      # 잘린 파일
+        b"not a pickle",
+        pickle.dumps(("key", "value"))[:-3],
+        # 사라진 모듈·속성을 가리키는 pickle (다른 버전이 남긴 캐시)
+        b"cno_such_module\nThing\n.",
+        b"csrc.pair_designer_v4\nno_such_attr\n.",
+    ])
+    def test_unreadable_cache_is_a_miss(self, capsys, payload):
+        self.cache_dir.mkdir()
+        (self.cache_dir / "cand.pkl").write_bytes(payload)
+        assert v4.load_candidates(self.key(), 1) is None
+        self.run(capsys, "--cache")
+        assert self.rank_calls == 1
+        assert v4.load_candidates(self.key(), 1) is not None
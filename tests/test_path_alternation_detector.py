@@ -0,0 +1,136 @@
+"""path_alternation_detector — 가지치기 BFS 를 전체 경로 나열(exhaustive_paths)과 비교."""
+
+from collections import Counter
+
+import pytest
+
+import src.path_alternation_detector as detector
+from src.path_alternation_detector import (
+    _bfs_states,
+    _path_of,
+    build_graph,
+    find_alternation_paths,
+    scan_alternation,
+    select_alternation_paths,
+)
+from tests.conftest import exhaustive_paths
+
+
+# 이웃 없는 노드·중복 엣지 — dangling=True 면 노드 목록에 없는 끝점까지
+DETECTOR_KG = dict(odd_ids=True, duplicate=True)
+
+
+def bfs_paths(kg, max_depth, min_score, max_paths=None):
+    nodes_index, graph, _ = build_graph(kg)
+    ids, node_of, parent_of, depth_of, trans_of, hits = _bfs_states(
+        nodes_index, graph, max_depth=max_depth, max_paths=max_paths,
+        min_score=min_score, workers=1,
+    )
+    return [
+        (tuple(_path_of(k, ids, node_of, parent_of)), trans_of[k] / (depth_of[k] - 1))
+        for k in hits
+    ]
+
+
+def at_least(paths, min_score):
+    return [p for p, score in paths if score >= min_score]
+
+
+class TestPrunedBfs:
+    @pytest.mark.parametrize("max_depth", [3, 4, 5])
+    @pytest.mark.parametrize("min_score", [0.0, 0.25, 0.5, 0.6, 0.75, 1.0])
+    @pytest.mark.parametrize("seed", range(3))
+    def test_matches_exhaustive(self, make_kg, seed, min_score, max_depth):
+        kg = make_kg(22, 36, seed=seed, dangling=True, **DETECTOR_KG)
+        expected = at_least(exhaustive_paths(kg, max_depth), min_score)
+        pruned = at_least(bfs_paths(kg, max_depth, min_score), min_score)
+        assert Counter(pruned) == Counter(expected)
+        # 가지치기는 상태만 빼므로 남은 경로의 BFS 순서는 가지치기 없는 탐색과 같다
+        assert pruned == at_least(bfs_paths(kg, max_depth, 0.0), min_score)
+
+    @pytest.mark.parametrize("min_score", [0.25, 0.5, 0.75, 1.0])
+    @pytest.mark.parametrize("min_length", [2, 3, 5])
+    def test_results_match_unpruned(self, make_kg, min_score, min_length):
+        kg = make_kg(22, 36, seed=11, **DETECTOR_KG)   # 출력 패턴은 노드 목록의 출처만 사용
+        kwargs = dict(min_length=min_length, min_score=min_score, max_depth=5, workers=1)
+        # 유한한 max_paths 는 가지치기를 끈다 — 경로 수보다 크게 잡으면 전체 탐색과 같다
+        pruned, _ = find_alternation_paths(kg, max_paths=None, **kwargs)
+        full, _ = find_alternation_paths(kg, max_paths=10 ** 9, **kwargs)
+        assert pruned == full
+
+    @pytest.mark.parametrize("min_score", [0.25, 0.5, 0.75, 1.0])
+    def test_select_after_pruned_scan(self, make_kg, min_score):
+        kg = make_kg(22, 36, seed=11, **DETECTOR_KG)   # 출력 패턴은 노드 목록의 출처만 사용
+        kwargs = dict(max_depth=5, max_paths=None, workers=1)
+        pruned = scan_alternation(kg, min_score=min_score, **kwargs)
+        full = scan_alternation(kg, min_score=0.0, **kwargs)
+        for min_length in (2, 3, 5):
+            expected, _ = find_alternation_paths(kg, min_length, min_score, **kwargs)
+            assert select_alternation_paths(pruned, min_length, min_score) == expected
+            assert select_alternation_paths(full, min_length, min_score) == expected
+
+    def test_prunes_states(self, make_kg):
+        kg = make_kg(22, 36, seed=1, dangling=True, **DETECTOR_KG)
+        assert len(bfs_paths(kg, 5, 0.75)) < len(bfs_paths(kg, 5, 0.0))
+
+
+class TestParallelBfs:
+    @pytest.fixture(autouse=True)
+    def force_parallel(self, monkeypatch):
+        # 작은 KG에서도 프로세스 풀 경로를 타도록 — 호출 횟수로 실제 사용 여부 확인
+        monkeypatch.setattr(detector, "PARALLEL_MIN_NODES", 1)
+        self.parallel_calls = 0
+        original = detector._bfs_parallel
+
+        def spy(*args, **kwargs):
+            self.parallel_calls += 1
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(detector, "_bfs_parallel", spy)
+
+    @pytest.mark.parametrize("workers", [2, 3])
+    @pytest.mark.parametrize("unique", [False, True])
+    @pytest.mark.parametrize("min_score", [0.0, 0.5])
+    def test_states_match_serial(self, make_kg, workers, unique, min_score):
+        nodes_index, graph, _ = build_graph(
+            make_kg(40, 70, seed=workers, dangling=True, **DETECTOR_KG))
+        kwargs = dict(max_depth=5, max_paths=None, min_score=min_score, unique=unique)
+        serial = _bfs_states(nodes_index, graph, workers=1, **kwargs)
+        parallel = _bfs_states(nodes_index, graph, workers=workers, **kwargs)
+        assert self.parallel_calls == 1
+        assert [list(col) for col in parallel] == [list(col) for col in serial]
+
+    @pytest.mark.parametrize("unique", [False, True])
+    @pytest.mark.parametrize("top_k", [None, 1, 7, 10_000])
+    def test_results_match_serial(self, make_kg, unique, top_k):
+        kg = make_kg(40, 70, seed=5, **DETECTOR_KG)
+        kwargs = dict(min_length=3, min_score=0.5, max_depth=5, max_paths=None,
+                      top_k=top_k, unique=unique)
+        serial, _ = find_alternation_paths(kg, workers=1, **kwargs)
+        parallel, _ = find_alternation_paths(kg, workers=2, **kwargs)
+        assert self.parallel_calls == 1
+        assert parallel == serial
+        if top_k is not None:
+            full, _ = find_alternation_paths(kg, workers=2, **dict(kwargs, top_k=None))
+            assert parallel == full[:top_k]
+
+    def test_unique_halves_paths(self, make_kg):
+        kg = make_kg(40, 70, seed=6, **DETECTOR_KG)
+        kwargs = dict(min_length=2, min_score=0.0, max_depth=4, max_paths=None, workers=2)
+        both, _ = find_alternation_paths(kg, **kwargs)
+        one, _ = find_alternation_paths(kg, unique=True, **kwargs)
+        forward = Counter(tuple(r["path"]) for r in one)
+        backward = Counter(tuple(reversed(r["path"])) for r in one)
+        assert Counter(tuple(r["path"]) for r in both) == forward + backward
+
+
+class TestFindAlternationPathsApi:
+    def test_returns_results_and_nodes_index(self, make_kg):
+        # 기존 호출부 호환 — 위치 인자 5개, (results, nodes_index) 2-튜플
+        kg = make_kg(22, 36, seed=2, **DETECTOR_KG)
+        out = find_alternation_paths(kg, 3, 0.5, 7, 1000)
+        assert len(out) == 2
+        results, nodes_index = out
+        assert results
+        assert set(nodes_index) == {n["id"] for n in kg["nodes"]}
+        assert all(len(r["path"]) >= 3 and r["score"] >= 0.5 for r in results)
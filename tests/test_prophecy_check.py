@@ -0,0 +1,76 @@
+"""prophecy_check — KG 로드(빈 그래프 폴백·intern)와 --json 출력이 stdlib json 과 같은 텍스트인지."""
+
+import io
+import json
+import sys
+
+import pytest
+
+import src.prophecy_check as prophecy
+from src.jsonio import json_dumps
+
+
+KG = {
+    "nodes": [
+        {"id": "n-001", "type": "question", "label": "창발은 측정 가능한가?"},
+        {"id": "n-002", "type": "prediction", "label": "교대 출처가 창발을 만든다 [55%]",
+         "source": "록이", "cycle": 26, "result": "true", "note": "검증됨"},
+        {"id": "n-003", "type": "prediction", "label": "경계는 사라진다",
+         "source": "cokac", "cycle": 27, "result": "partial"},
+        {"id": "n-004", "type": "prediction", "label": "미래 노드", "source": "cokac"},
+    ],
+    "edges": [
+        {"from": "n-002", "to": "n-001", "relation": "predicts_from"},
+        {"from": "n-003", "to": "n-missing", "relation": "predicts_from"},
+    ],
+}
+
+
+@pytest.fixture
+def run_main(monkeypatch, tmp_path):
+    kg_file = tmp_path / "kg.json"
+    kg_file.write_bytes(json_dumps(KG))
+    monkeypatch.setattr(prophecy, "KG_FILE", kg_file)
+
+    def run(*args):
+        monkeypatch.setattr(sys, "argv", ["prophecy_check.py", *args])
+        prophecy.main()
+    return run
+
+
+class TestJsonOutput:
+    def test_json_goes_through_text_stdout(self, run_main, monkeypatch):
+        # .buffer 없는 텍스트 스트림(StringIO·교체된 sys.stdout)에도 그대로 써져야 한다
+        stdout = io.StringIO()
+        monkeypatch.setattr(sys, "stdout", stdout)
+        run_main("--json")
+        out = stdout.getvalue()
+        results = prophecy.check_prophecies(KG)
+        report = {"accuracy": prophecy.score(results), "prophecies": results}
+        assert out == json.dumps(report, ensure_ascii=False, indent=2) + "\n"
+        assert json.loads(out)["accuracy"] == 0.5
+
+    def test_json_after_print_keeps_order(self, run_main, capsys):
+        print("앞선 출력")
+        run_main("--json")
+        before, _, body = capsys.readouterr().out.partition("\n")
+        assert before == "앞선 출력"
+        assert json.loads(body)["prophecies"][0]["subjects"] == [
+            {"id": "n-001", "label": "창발은 측정 가능한가?"}]
+
+
+class TestLoadKg:
+    @pytest.mark.parametrize("content", [None, b"", b"{\"nodes\": ["])
+    def test_unreadable_kg_is_empty(self, monkeypatch, tmp_path, content):
+        kg_file = tmp_path / "kg.json"
+        if content is not None:
+            kg_file.write_bytes(content)
+        monkeypatch.setattr(prophecy, "KG_FILE", kg_file)
+        assert prophecy.load_kg() == {"nodes": [], "edges": []}
+
+    def test_ids_and_relations_interned(self, run_main):
+        kg = prophecy.load_kg()
+        assert kg["nodes"] == KG["nodes"]
+        for e in kg["edges"]:
+            assert e["relation"] is sys.intern("predicts_from")
+            assert e["from"] is sys.intern(e["from"])
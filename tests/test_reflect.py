@@ -0,0 +1,193 @@
+"""reflect — suggest-edges 후보 가지치기(brute_force_suggestions 와 비교), GraphAnalyzer 캐시, timeline 파싱."""
+
+import argparse
+import re
+
+import pytest
+
+import src.reflect as reflect
+from src.reflect import (
+    _compute_similarity,
+    _node_features,
+    _similarity_from_features,
+    _suggest_candidates,
+    GraphAnalyzer,
+    cmd_suggest_edges,
+)
+from tests.conftest import brute_force_suggestions
+
+
+THRESHOLDS = [0.0, 0.05, 0.2, 0.5, 0.55, 0.65]
+
+SUGGESTION_RE = re.compile(r"^\S+\s+(\S+)\(.*?\) → (\S+)\(.*?\) \[유사도: ([0-9.]+)\]")
+
+
+# 레이블·내용이 같은 노드 쌍 — Jaccard 1.0 이 상한 가지치기 경계를 시험
+SUGGEST_KG = dict(n_nodes=45, n_edges=30, twins=True)
+
+
+class TestSuggestCandidates:
+    @pytest.mark.parametrize("threshold", THRESHOLDS)
+    @pytest.mark.parametrize("seed", range(3))
+    def test_candidates_cover_all_pairs_above_threshold(self, make_kg, seed, threshold):
+        nodes = make_kg(seed=seed, **SUGGEST_KG)["nodes"]
+        features = [_node_features(n) for n in nodes]
+        expected = {
+            (i, j): _compute_similarity(nodes[i], nodes[j])
+            for i in range(len(nodes)) for j in range(i + 1, len(nodes))
+        }
+        expected = {ij: s for ij, s in expected.items() if s >= threshold}
+        candidates = _suggest_candidates(features, threshold)
+        assert candidates == sorted(set(candidates))
+        got = {}
+        for i, j in candidates:
+            sim = _similarity_from_features(features[i], features[j], threshold)
+            if sim >= threshold:
+                got[(i, j)] = sim
+        assert got == expected
+
+    @pytest.mark.parametrize("threshold", THRESHOLDS)
+    def test_threshold_keeps_values_above_threshold(self, make_kg, threshold):
+        features = [_node_features(n) for n in make_kg(seed=9, **SUGGEST_KG)["nodes"]]
+        for i in range(len(features)):
+            for j in range(i + 1, len(features)):
+                exact = _similarity_from_features(features[i], features[j])
+                pruned = _similarity_from_features(features[i], features[j], threshold)
+                assert pruned == exact or (pruned == 0.0 and exact < threshold)
+
+
+class TestSuggestEdgesCommand:
+    @pytest.mark.parametrize("cross_only", [False, True])
+    @pytest.mark.parametrize("threshold", THRESHOLDS)
+    def test_output_matches_brute_force(self, monkeypatch, capsys, make_kg,
+                                        threshold, cross_only):
+        graph = make_kg(seed=4, **SUGGEST_KG)
+        monkeypatch.setattr(reflect, "load_graph", lambda: graph)
+        cmd_suggest_edges(argparse.Namespace(threshold=threshold, cross_source_only=cross_only))
+        printed = [
+            (m.group(1), m.group(2), m.group(3))
+            for m in map(SUGGESTION_RE.match, capsys.readouterr().out.splitlines()) if m
+        ]
+        expected = [(a, b, f"{sim:.2f}")
+                    for a, b, sim in brute_force_suggestions(graph, threshold, cross_only)]
+        assert printed == expected
+
+
+ANALYZER_GRAPH = {
+    "nodes": [
+        {"id": "q1", "type": "question", "source": "록이", "tags": ["gap", "memory"]},
+        {"id": "q2", "type": "question", "source": "cokac", "tags": ["gap"]},
+        {"id": "a1", "type": "insight", "source": "cokac", "tags": ["memory"]},
+        {"id": "lone", "type": "insight", "source": "록이"},
+    ],
+    "edges": [
+        {"from": "a1", "to": "q1", "relation": "answers"},
+        {"from": "q2", "to": "a1", "relation": "relates_to"},
+    ],
+}
+
+CACHED_METHODS = {
+    "orphan_nodes": "_orphans",
+    "unanswered_questions": "_unanswered",
+    "source_distribution": "_source_dist",
+    "type_distribution": "_type_dist",
+    "tag_clusters": "_tag_clusters",
+}
+
+
+class TestGraphAnalyzerCache:
+    def test_method_results(self):
+        a = GraphAnalyzer(ANALYZER_GRAPH)
+        assert [n["id"] for n in a.orphan_nodes()] == ["lone"]
+        assert [n["id"] for n in a.unanswered_questions()] == ["q2"]
+        assert a.source_distribution() == {"록이": 2, "cokac": 2}
+        assert a.type_distribution() == {"question": 2, "insight": 2}
+        assert a.tag_clusters() == {"gap": ["q1", "q2"], "memory": ["q1", "a1"]}
+
+    @pytest.mark.parametrize("method, attr", CACHED_METHODS.items())
+    def test_method_memoized_privately(self, method, attr):
+        a = GraphAnalyzer(ANALYZER_GRAPH)
+        assert attr not in vars(a)
+        first = getattr(a, method)()
+        assert vars(a)[attr] is first
+        assert getattr(a, method)() is first
+
+    @pytest.mark.parametrize("method, attr", CACHED_METHODS.items())
+    def test_cache_is_a_snapshot_until_invalidated(self, method, attr):
+        graph = {"nodes": [dict(n) for n in ANALYZER_GRAPH["nodes"]],
+                 "edges": list(ANALYZER_GRAPH["edges"])}
+        a = GraphAnalyzer(graph)
+        before = getattr(a, method)()
+        # 분석기는 생성 시점 그래프 기준 — 노드 추가 후에도 캐시 값 유지
+        a.nodes["q3"] = {"id": "q3", "type": "question", "source": "gpt", "tags": ["gap"]}
+        assert getattr(a, method)() is before
+        # 캐시(과 그 바탕 인덱스)를 지우면 다시 계산
+        for key in (attr, "_node_scan"):
+            vars(a).pop(key, None)
+        after = getattr(a, method)()
+        assert after != before
+        assert after == getattr(GraphAnalyzer({"nodes": list(a.nodes.values()),
+                                               "edges": graph["edges"]}), method)()
+
+    def test_health_score_memoized(self):
+        a = GraphAnalyzer(ANALYZER_GRAPH)
+        # 50 + 엣지 밀도 10 - 고립 5 - 미답 2.5 + 크기 4
+        assert a.health_score() == 56
+        assert vars(a)["_health"] == 56
+        a.nodes.clear()
+        assert a.health_score() == 56
+        del a._health
+        assert a.health_score() == 0
+
+
+class TestGraphAnalyzerEdgeIndex:
+    def test_lookup_does_not_connect_missing_nodes(self):
+        # 인덱스를 먼저 조회한 뒤에도 연결 노드·고립·건강 점수가 그대로여야 한다
+        a = GraphAnalyzer(ANALYZER_GRAPH)
+        assert a.in_edges.get("lone") is None
+        with pytest.raises(KeyError):
+            a.in_edges["lone"]
+        with pytest.raises(KeyError):
+            a.out_edges["lone"]
+        with pytest.raises(KeyError):
+            a.edges_by_rel_from["answers"]["lone"]
+        assert "lone" not in a.in_edges
+        assert "lone" not in a.connected
+        assert [n["id"] for n in a.orphan_nodes()] == ["lone"]
+        assert a.health_score() == GraphAnalyzer(ANALYZER_GRAPH).health_score()
+
+    def test_connected_is_immutable(self):
+        a = GraphAnalyzer(ANALYZER_GRAPH)
+        assert a.connected == {"q1", "q2", "a1"}
+        assert isinstance(a.connected, frozenset)
+
+    def test_index_contents(self):
+        a = GraphAnalyzer(ANALYZER_GRAPH)
+        answers, relates = ANALYZER_GRAPH["edges"]
+        assert a.in_edges == {"q1": [answers], "a1": [relates]}
+        assert a.out_edges == {"a1": [answers], "q2": [relates]}
+        assert a.edges_by_rel_from == {"answers": {"a1": [answers]},
+                                       "relates_to": {"q2": [relates]}}
+        assert a.edges_by_rel_to == {"answers": {"q1": [answers]},
+                                     "relates_to": {"a1": [relates]}}
+        assert a.answered_question_ids == {"a1", "q1"}
+
+
+class TestTimeline:
+    def test_reads_lines_like_stdlib_json(self, monkeypatch, tmp_path, capsys):
+        # NaN·19자리 정수는 표준 json 으로, 깨진 줄은 건너뛴다
+        history = tmp_path / "emergence-history.jsonl"
+        history.write_text("\n".join([
+            '{"cycle": 1, "date": "2026-01-01", "score": 0.25, "nodes": 10, "edges": 12}',
+            '{"cycle": 2, "date": "2026-01-02", "score": 0.5',
+            '',
+            '{"cycle": 3, "date": "2026-01-03", "score": NaN, "nodes": 11}',
+            '{"cycle": 12345678901234567890, "date": "창발", "score": 0.75}',
+        ]) + "\n", encoding="utf-8")
+        monkeypatch.setattr(reflect, "HISTORY_FILE", history)
+        reflect.cmd_timeline(argparse.Namespace())
+        out = capsys.readouterr().out
+        assert "3개 기록" in out
+        assert "12345678901234567890" in out
+        assert re.search(r"\|\s+nan\s+\|", out)
+        assert "사이클 3 → 12345678901234567890" in out